@@ -0,0 +1,32 @@
+"""clock events user ts index
+
+Revision ID: 5b7e1c3a9d42
+Revises: 16279d9e2d25
+Create Date: 2026-10-17 09:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e1c3a9d42'
+down_revision: Union[str, Sequence[str], None] = '16279d9e2d25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_clock_events_user_ts",
+        "clock_events",
+        ["user_id", "ts_utc"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_clock_events_user_ts", table_name="clock_events")
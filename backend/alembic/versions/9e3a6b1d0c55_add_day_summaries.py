@@ -0,0 +1,75 @@
+"""add day summaries
+
+Revision ID: 9e3a6b1d0c55
+Revises: c41d8e2f7a10
+Create Date: 2026-10-17 14:21:47.103921
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e3a6b1d0c55'
+down_revision: Union[str, Sequence[str], None] = 'c41d8e2f7a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('day_summaries',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('date_local', sa.Date(), nullable=False),
+    sa.Column('worked_minutes', sa.Integer(), nullable=False),
+    sa.Column('break_minutes', sa.Integer(), nullable=False),
+    sa.Column('required_break_minutes', sa.Integer(), nullable=False),
+    sa.Column('required_continuous_break_minutes', sa.Integer(), nullable=False),
+    sa.Column('max_continuous_break_minutes', sa.Integer(), nullable=False),
+    sa.Column('break_compliant_total', sa.Boolean(), nullable=False),
+    sa.Column('break_compliant_continuous', sa.Boolean(), nullable=False),
+    sa.Column('has_open_interval', sa.Boolean(), nullable=False),
+    sa.Column('home_minutes', sa.Integer(), nullable=False),
+    sa.Column('office_minutes', sa.Integer(), nullable=False),
+    sa.Column('max_daily_work_exceeded', sa.Boolean(), nullable=False),
+    sa.Column('first_come_ts_utc', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_go_ts_utc', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('settled', sa.Boolean(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'date_local')
+    )
+    op.create_table('period_summaries',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('period', sa.String(length=8), nullable=False),
+    sa.Column('period_start', sa.Date(), nullable=False),
+    sa.Column('worked_minutes', sa.Integer(), nullable=False),
+    sa.Column('break_minutes', sa.Integer(), nullable=False),
+    sa.Column('home_minutes', sa.Integer(), nullable=False),
+    sa.Column('office_minutes', sa.Integer(), nullable=False),
+    sa.Column('worked_days', sa.Integer(), nullable=False),
+    sa.Column('home_office_days', sa.Integer(), nullable=False),
+    sa.Column('open_days', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'period', 'period_start')
+    )
+    # Existing users keep reading live summaries until
+    # `python -m app.day_summaries` has built their rows.
+    op.add_column(
+        "user_clock_state",
+        sa.Column(
+            "day_summaries_ready",
+            sa.Boolean(),
+            nullable=False,
+            server_default=sa.false(),
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("user_clock_state", "day_summaries_ready")
+    op.drop_table('period_summaries')
+    op.drop_table('day_summaries')
@@ -0,0 +1,63 @@
+"""add user clock state
+
+Revision ID: c41d8e2f7a10
+Revises: 5b7e1c3a9d42
+Create Date: 2026-10-17 10:03:12.518604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d8e2f7a10'
+down_revision: Union[str, Sequence[str], None] = '5b7e1c3a9d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user_clock_state',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('state', sa.String(length=16), nullable=False),
+    sa.Column('last_event_type', sa.String(length=16), nullable=True),
+    sa.Column('last_event_ts_utc', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_go_ts_utc', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.execute(
+        """
+        INSERT INTO user_clock_state
+            (user_id, state, last_event_type, last_event_ts_utc, last_go_ts_utc)
+        SELECT
+            e.user_id,
+            CASE e.type
+                WHEN 'COME' THEN 'WORKING'
+                WHEN 'BREAK_END' THEN 'WORKING'
+                WHEN 'BREAK_START' THEN 'BREAK'
+                ELSE 'OFF'
+            END,
+            e.type,
+            e.ts_utc,
+            (
+                SELECT MAX(g.ts_utc) FROM clock_events g
+                WHERE g.user_id = e.user_id AND g.type = 'GO'
+            )
+        FROM clock_events e
+        WHERE e.id = (
+            SELECT l.id FROM clock_events l
+            WHERE l.user_id = e.user_id
+            ORDER BY l.ts_utc DESC
+            LIMIT 1
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_clock_state')
@@ -0,0 +1,31 @@
+"""add user data version
+
+Revision ID: ce2478c66141
+Revises: d7f2c8a4e913
+Create Date: 2026-10-17 02:32:35.114807
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ce2478c66141'
+down_revision: Union[str, Sequence[str], None] = 'd7f2c8a4e913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column("data_version", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "data_version")
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from datetime import date, datetime, UTC
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta, UTC
 
 from sqlalchemy import and_, select
 from sqlalchemy.orm import Session
@@ -21,6 +22,31 @@ def user_has_absence_on_date(
     return db.scalar(stmt)
 
 
+def user_absences_in_range(
+    db: Session, *, user_id: int, start_date: date, end_date: date
+) -> list[Absence]:
+    stmt = (
+        select(Absence)
+        .where(Absence.user_id == user_id)
+        .where(and_(Absence.start_date <= end_date, Absence.end_date >= start_date))
+    )
+    return list(db.scalars(stmt).all())
+
+
+def absence_by_day(
+    absences: Iterable[Absence], *, start_date: date, end_date: date
+) -> dict[date, Absence]:
+    # Overlapping absences keep the first one listed for a day.
+    out: dict[date, Absence] = {}
+    for a in absences:
+        d = max(a.start_date, start_date)
+        last = min(a.end_date, end_date)
+        while d <= last:
+            out.setdefault(d, a)
+            d += timedelta(days=1)
+    return out
+
+
 def local_date_from_utc(ts_utc: datetime, tz: str) -> date:
 
     zone = ZoneInfo(tz)
@@ -0,0 +1,374 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import chain
+from typing import NamedTuple
+from zoneinfo import ZoneInfo
+
+from fastapi import HTTPException
+from sqlalchemy import desc, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.absence_service import user_absences_in_range
+from app.clock_state import rebuild_clock_state
+from app.clock_validation import as_utc, validate_event_fields, validate_sequence
+from app.data_version import bump_data_version
+from app.day_summaries import refresh_day_summaries
+from app.db import WriteSessionLocal, begin_write
+from app.models import ClockEvent, User, utc_now
+
+DEFAULT_CHUNK_SIZE = 10_000
+# Stays well below SQLite's limit on bound parameters per statement.
+ID_LOOKUP_BATCH = 500
+
+
+class ImportRow(NamedTuple):
+    line: int
+    ts_utc: datetime
+    type: str
+    location: str | None
+    client_event_id: str | None
+
+
+class ClockImportError(Exception):
+    def __init__(self, line: int | None, detail: str) -> None:
+        super().__init__(detail)
+        self.line = line
+        self.detail = detail
+
+
+@dataclass
+class ImportResult:
+    rows_read: int = 0
+    rows_imported: int = 0
+    rows_skipped: int = 0
+    last_committed_ts_utc: datetime | None = None
+    error_line: int | None = None
+    error: str | None = None
+
+
+def _parse_row(line: int, raw: dict) -> ImportRow:
+    ts_raw = raw.get("ts_utc")
+    event_type = raw.get("type")
+    location = raw.get("location") or None
+    client_event_id = raw.get("client_event_id") or None
+    if not ts_raw or not event_type:
+        raise ClockImportError(line, "ts_utc and type are required")
+    try:
+        ts = as_utc(datetime.fromisoformat(ts_raw))
+    except (TypeError, ValueError):
+        raise ClockImportError(line, "Invalid ts_utc") from None
+    if client_event_id is not None and len(client_event_id) > 64:  # noqa: PLR2004
+        raise ClockImportError(line, "client_event_id too long")
+    try:
+        validate_event_fields(event_type=event_type, location=location)
+    except HTTPException as exc:
+        raise ClockImportError(line, exc.detail) from None
+    return ImportRow(line, ts, event_type, location, client_event_id)
+
+
+def _read_lines(lines: Iterable[bytes]) -> Iterator[str]:
+    # Decoded line by line, so an invalid byte is reported on its own line.
+    for n, raw in enumerate(lines, start=1):
+        try:
+            yield raw.decode("utf-8")
+        except UnicodeDecodeError:
+            raise ClockImportError(n, "Invalid UTF-8") from None
+
+
+def parse_rows(lines: Iterable[bytes]) -> Iterator[ImportRow]:
+    it = _read_lines(lines)
+    first = next(it, None)
+    while first is not None and not first.strip():
+        first = next(it, None)
+    if first is None:
+        return
+
+    if first.lstrip().startswith("{"):
+        for n, text in enumerate(chain([first], it), start=1):
+            if not text.strip():
+                continue
+            try:
+                raw = json.loads(text)
+            except ValueError:
+                raise ClockImportError(n, "Invalid JSON") from None
+            if not isinstance(raw, dict):
+                raise ClockImportError(n, "Expected a JSON object")
+            yield _parse_row(n, raw)
+        return
+
+    reader = csv.DictReader(chain([first], it))
+    while True:
+        try:
+            raw = next(reader, None)
+        except csv.Error as exc:
+            # line_num does not count the line that failed.
+            raise ClockImportError(
+                reader.line_num + 1, f"Invalid CSV: {exc}"
+            ) from None
+        if raw is None:
+            return
+        yield _parse_row(reader.line_num, raw)
+
+
+def _neighbour(
+    db: Session, user_id: int, ts_utc: datetime, *, before: bool
+) -> ClockEvent | None:
+    stmt = select(ClockEvent).where(ClockEvent.user_id == user_id)
+    if before:
+        stmt = stmt.where(ClockEvent.ts_utc < ts_utc).order_by(desc(ClockEvent.ts_utc))
+    else:
+        stmt = stmt.where(ClockEvent.ts_utc >= ts_utc).order_by(ClockEvent.ts_utc)
+    return db.scalar(stmt.limit(1))
+
+
+def _validate_chunk(anchor, buffer: list[ImportRow]) -> None:
+    seq = ([anchor] if anchor is not None else []) + buffer
+    try:
+        validate_sequence(seq, starts_history=anchor is None)
+        return
+    except HTTPException as exc:
+        detail = exc.detail
+
+    # Locate the offending row for the error report.
+    for i in range(len(seq)):
+        window = seq[max(0, i - 1) : i + 1]
+        try:
+            validate_sequence(window, starts_history=anchor is None and i == 0)
+        except HTTPException as exc:
+            raise ClockImportError(getattr(seq[i], "line", None), exc.detail) from None
+    raise ClockImportError(None, detail)
+
+
+def _check_absences(
+    db: Session, user_id: int, zone: ZoneInfo, buffer: list[ImportRow]
+) -> None:
+    absences = user_absences_in_range(
+        db,
+        user_id=user_id,
+        start_date=buffer[0].ts_utc.astimezone(zone).date(),
+        end_date=buffer[-1].ts_utc.astimezone(zone).date(),
+    )
+    if not absences:
+        return
+    for row in buffer:
+        day_local = row.ts_utc.astimezone(zone).date()
+        if any(a.start_date <= day_local <= a.end_date for a in absences):
+            raise ClockImportError(
+                row.line, "Cannot create clock events on absence days"
+            )
+
+
+def _check_client_event_ids(
+    db: Session, user_id: int, buffer: list[ImportRow]
+) -> None:
+    seen: set[str] = set()
+    ids: list[str] = []
+    for row in buffer:
+        if row.client_event_id is None:
+            continue
+        if row.client_event_id in seen:
+            raise ClockImportError(row.line, "Duplicate client_event_id")
+        seen.add(row.client_event_id)
+        ids.append(row.client_event_id)
+
+    stored: set[str] = set()
+    for i in range(0, len(ids), ID_LOOKUP_BATCH):
+        stored.update(
+            db.scalars(
+                select(ClockEvent.client_event_id)
+                .where(ClockEvent.user_id == user_id)
+                .where(ClockEvent.client_event_id.in_(ids[i : i + ID_LOOKUP_BATCH]))
+            )
+        )
+    if stored:
+        for row in buffer:
+            if row.client_event_id in stored:
+                raise ClockImportError(row.line, "Duplicate client_event_id")
+
+
+def _commit_boundary(buffer: list[ImportRow], succ: ClockEvent | None) -> int:
+    # A committed prefix must leave a valid history behind, so it has to end
+    # on an event the next stored event may follow.
+    if succ is None:
+        return len(buffer)
+    for i in range(len(buffer) - 1, -1, -1):
+        try:
+            validate_sequence([buffer[i], succ], starts_history=False)
+        except HTTPException:
+            continue
+        return i + 1
+    return 0
+
+
+def import_clock_events(  # noqa: PLR0913, PLR0915
+    db: Session,
+    *,
+    user: User,
+    rows: Iterable[ImportRow],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    resume_after: datetime | None = None,
+    on_commit: Callable[[ImportResult], None] | None = None,
+) -> ImportResult:
+    result = ImportResult()
+    user_id = user.id
+    tz = user.timezone
+    zone = ZoneInfo(tz)
+    max_ts = utc_now() + timedelta(minutes=5)
+    if resume_after is not None:
+        resume_after = as_utc(resume_after)
+
+    started = False
+    anchor = None
+    succ: ClockEvent | None = None
+    succ_ts: datetime | None = None
+    buffer: list[ImportRow] = []
+    pending = 0
+
+    def flush(*, final: bool) -> None:
+        nonlocal pending
+        pending = 0
+        begin_write(db)
+        _validate_chunk(anchor, buffer)
+        _check_absences(db, user_id, zone, buffer)
+        _check_client_event_ids(db, user_id, buffer)
+
+        cut = _commit_boundary(buffer, succ)
+        if cut > 0:
+            commit(cut)
+        if final and buffer:
+            raise ClockImportError(
+                buffer[-1].line,
+                "Import must end with an event the next existing event can follow",
+            )
+
+    def commit(cut: int) -> None:
+        nonlocal anchor
+        committed = buffer[:cut]
+        try:
+            db.execute(
+                ClockEvent.__table__.insert(),
+                [
+                    {
+                        "user_id": user_id,
+                        "ts_utc": r.ts_utc,
+                        "type": r.type,
+                        "location": r.location,
+                        "client_event_id": r.client_event_id,
+                    }
+                    for r in committed
+                ],
+            )
+        except IntegrityError:
+            # Fallback only: _check_client_event_ids already ran under the
+            # same write lock.
+            db.rollback()
+            raise ClockImportError(
+                committed[0].line, "Duplicate client_event_id"
+            ) from None
+        rebuild_clock_state(db, user_id)
+        refresh_day_summaries(
+            db,
+            user_id=user_id,
+            tz=tz,
+            days={r.ts_utc.astimezone(zone).date() for r in committed},
+        )
+        bump_data_version(db, user_id)
+        db.commit()
+
+        result.rows_imported += cut
+        result.last_committed_ts_utc = committed[-1].ts_utc
+        anchor = committed[-1]
+        del buffer[:cut]
+        if on_commit is not None:
+            on_commit(result)
+
+    try:
+        for row in rows:
+            result.rows_read += 1
+            if resume_after is not None and row.ts_utc <= resume_after:
+                result.rows_skipped += 1
+                continue
+
+            if not started:
+                started = True
+                anchor = _neighbour(db, user_id, row.ts_utc, before=True)
+                succ = _neighbour(db, user_id, row.ts_utc, before=False)
+                succ_ts = as_utc(succ.ts_utc) if succ is not None else None
+
+            if row.ts_utc > max_ts:
+                raise ClockImportError(row.line, "ts_utc cannot be in the future")
+            if succ_ts is not None and row.ts_utc >= succ_ts:
+                raise ClockImportError(
+                    row.line, "Import overlaps existing clock events"
+                )
+
+            buffer.append(row)
+            pending += 1
+            if pending >= chunk_size:
+                flush(final=False)
+
+        if buffer:
+            flush(final=True)
+    except ClockImportError as exc:
+        db.rollback()
+        result.error_line = exc.line
+        result.error = exc.detail
+
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Import historical clock events from CSV or NDJSON."
+    )
+    parser.add_argument("--email", required=True)
+    parser.add_argument("path")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--resume-after", type=datetime.fromisoformat)
+    args = parser.parse_args()
+
+    def progress(result: ImportResult) -> None:
+        print(
+            f"committed {result.rows_imported} rows"
+            f" up to {result.last_committed_ts_utc.isoformat()}",
+            flush=True,
+        )
+
+    with WriteSessionLocal() as db:
+        user = db.scalar(select(User).where(User.email == args.email.lower()))
+        if user is None:
+            sys.exit(f"unknown user {args.email}")
+
+        with open(args.path, "rb") as f:
+            result = import_clock_events(
+                db,
+                user=user,
+                rows=parse_rows(f),
+                chunk_size=max(1, args.chunk_size),
+                resume_after=args.resume_after,
+                on_commit=progress,
+            )
+
+    print(
+        f"read {result.rows_read}, imported {result.rows_imported},"
+        f" skipped {result.rows_skipped}"
+    )
+    if result.error is not None:
+        resume = (
+            f" (resume with --resume-after {result.last_committed_ts_utc.isoformat()})"
+            if result.last_committed_ts_utc is not None
+            else ""
+        )
+        sys.exit(f"line {result.error_line}: {result.error}{resume}")
+
+
+if __name__ == "__main__":
+    main()
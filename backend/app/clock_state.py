@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import desc, select
+from sqlalchemy.orm import Session
+
+from app.models import ClockEvent, UserClockState, utc_datetime
+
+STATE_AFTER_EVENT = {
+    "COME": "WORKING",
+    "BREAK_START": "BREAK",
+    "BREAK_END": "WORKING",
+    "GO": "OFF",
+}
+
+
+def _latest(
+    db: Session, user_id: int, *, event_type: str | None = None
+) -> ClockEvent | None:
+    stmt = select(ClockEvent).where(ClockEvent.user_id == user_id)
+    if event_type is not None:
+        stmt = stmt.where(ClockEvent.type == event_type)
+    return db.scalar(stmt.order_by(desc(ClockEvent.ts_utc)).limit(1))
+
+
+def rebuild_clock_state(db: Session, user_id: int) -> UserClockState:
+    row = db.get(UserClockState, user_id)
+    if row is None:
+        row = UserClockState(user_id=user_id)
+        db.add(row)
+
+    last = _latest(db, user_id)
+    last_go = last if last is not None and last.type == "GO" else None
+    if last is not None and last_go is None:
+        last_go = _latest(db, user_id, event_type="GO")
+
+    row.state = STATE_AFTER_EVENT[last.type] if last is not None else "OFF"
+    row.last_event_type = last.type if last is not None else None
+    row.last_event_ts_utc = last.ts_utc if last is not None else None
+    row.last_go_ts_utc = last_go.ts_utc if last_go is not None else None
+    return row
+
+
+def get_clock_state(db: Session, user_id: int) -> UserClockState:
+    row = db.get(UserClockState, user_id)
+    if row is None:
+        row = rebuild_clock_state(db, user_id)
+    return row
+
+
+def apply_appended_event(row: UserClockState, event: ClockEvent) -> None:
+    row.state = STATE_AFTER_EVENT[event.type]
+    row.last_event_type = event.type
+    row.last_event_ts_utc = event.ts_utc
+    if event.type == "GO":
+        row.last_go_ts_utc = event.ts_utc
+
+
+def apply_inserted_event(row: UserClockState, event: ClockEvent) -> None:
+    # Inserted before the last event, so only the last GO can move.
+    if event.type == "GO" and (
+        row.last_go_ts_utc is None
+        or utc_datetime(event.ts_utc) > utc_datetime(row.last_go_ts_utc)
+    ):
+        row.last_go_ts_utc = event.ts_utc
+
+
+def last_go_before(db: Session, user_id: int, ts_utc: datetime) -> datetime | None:
+    row = db.get(UserClockState, user_id)
+    if row is not None:
+        if row.last_go_ts_utc is None:
+            return None
+        last_go = utc_datetime(row.last_go_ts_utc)
+        if last_go < ts_utc:
+            return last_go
+
+    stmt = (
+        select(ClockEvent.ts_utc)
+        .where(ClockEvent.user_id == user_id)
+        .where(ClockEvent.type == "GO")
+        .where(ClockEvent.ts_utc < ts_utc)
+        .order_by(desc(ClockEvent.ts_utc))
+        .limit(1)
+    )
+    found = db.scalar(stmt)
+    return utc_datetime(found) if found is not None else None
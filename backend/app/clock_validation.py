@@ -38,7 +38,9 @@ def validate_event_fields(*, event_type: str, location: str | None) -> None:
         )
 
 
-def validate_sequence(events: list[ClockEvent]) -> None:  # noqa: PLR0912
+def validate_sequence(  # noqa: PLR0912
+    events: list[ClockEvent], *, starts_history: bool = True
+) -> None:
     if not events:
         return
 
@@ -46,7 +48,7 @@ def validate_sequence(events: list[ClockEvent]) -> None:  # noqa: PLR0912
         validate_event_fields(event_type=e.type, location=e.location)
 
         if i == 0:
-            if e.type != "COME":
+            if starts_history and e.type != "COME":
                 raise HTTPException(
                     status_code=status.HTTP_409_CONFLICT,
                     detail="First event must be COME",
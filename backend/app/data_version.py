@@ -0,0 +1,92 @@
+# ruff: noqa: B008
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from fastapi import Depends, Request, Response
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.db import get_db
+from app.models import User, UserClockState, utc_now
+from app.report_cache import report_cache
+from app.report_encoding import wants_columnar
+from app.reporting import epoch_us, local_day
+from app.security import get_current_user
+
+
+class NotModified(Exception):
+    def __init__(self, headers: dict[str, str]) -> None:
+        super().__init__(headers["ETag"])
+        self.headers = headers
+
+
+def bump_data_version(db: Session, user_id: int) -> None:
+    report_cache.discard_user(user_id)
+    db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(data_version=User.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def user_etag(db: Session, user: User, now_utc: datetime) -> str:
+    # Responses also depend on the local date, and on the current minute while
+    # an interval is open.
+    parts = [
+        str(user.id),
+        str(user.data_version),
+        local_day(now_utc, user.timezone).isoformat(),
+    ]
+    state = db.get(UserClockState, user.id)
+    if state is None or state.state != "OFF":
+        parts.append(str(epoch_us(now_utc) // 60_000_000))
+    return f'W/"{"-".join(parts)}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    tag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == tag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def _conditional(
+    request: Request, response: Response, etag: str, *, columnar: bool
+) -> None:
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if columnar:
+        headers["Vary"] = "Accept"
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, etag):
+        raise NotModified(headers)
+    response.headers.update(headers)
+
+
+def conditional_get(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> None:
+    etag = user_etag(db, current_user, utc_now())
+    _conditional(request, response, etag, columnar=False)
+
+
+def conditional_get_columnar(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> None:
+    # For endpoints that can also answer in the columnar encoding: each
+    # representation needs its own tag.
+    etag = user_etag(db, current_user, utc_now())
+    if wants_columnar(request):
+        etag = etag[:-1] + '-columnar"'
+    _conditional(request, response, etag, columnar=True)
@@ -0,0 +1,480 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from collections.abc import Iterable, Iterator
+from dataclasses import astuple, replace
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.clock_state import get_clock_state
+from app.db import WriteSessionLocal
+from app.models import (
+    ClockEvent,
+    DaySummaryRow,
+    OvertimeCheckpoint,
+    PeriodSummary,
+    User,
+    UserClockState,
+    utc_datetime,
+    utc_now,
+)
+from app.report_pool import PackedEvents, pack_events, report_pool, unpack_events
+from app.reporting import (
+    DaySummary,
+    bucket_events,
+    compute_day_summaries,
+    compute_day_summary,
+    day_bounds_utc,
+    day_start_us,
+    epoch_us,
+    first_come_last_go,
+    from_epoch_us,
+    local_day,
+)
+
+WEEK = "WEEK"
+MONTH = "MONTH"
+
+# DaySummary fields stored as-is; the rest period depends on the previous day
+# and is derived when reading.
+_STORED_FIELDS = (
+    "worked_minutes",
+    "break_minutes",
+    "required_break_minutes",
+    "required_continuous_break_minutes",
+    "max_continuous_break_minutes",
+    "break_compliant_total",
+    "break_compliant_continuous",
+    "has_open_interval",
+    "home_minutes",
+    "office_minutes",
+    "max_daily_work_exceeded",
+)
+
+_PERIOD_FIELDS = (
+    "worked_minutes",
+    "break_minutes",
+    "home_minutes",
+    "office_minutes",
+    "worked_days",
+    "home_office_days",
+    "open_days",
+)
+
+Events = list[tuple[str, datetime, str | None]]
+
+
+def week_start(d: date) -> date:
+    return d - timedelta(days=d.weekday())
+
+
+def month_start(d: date) -> date:
+    return d.replace(day=1)
+
+
+def next_month_start(d: date) -> date:
+    if d.month == 12:  # noqa: PLR2004
+        return date(d.year + 1, 1, 1)
+    return date(d.year, d.month + 1, 1)
+
+
+def _period_end(period: str, start: date) -> date:
+    if period == WEEK:
+        return start + timedelta(days=7)
+    return next_month_start(start)
+
+
+def _runs(days: Iterable[date]) -> list[tuple[date, date]]:
+    runs: list[tuple[date, date]] = []
+    for d in sorted(set(days)):
+        if runs and d == runs[-1][1] + timedelta(days=1):
+            runs[-1] = (runs[-1][0], d)
+        else:
+            runs.append((d, d))
+    return runs
+
+
+def _range_events(
+    db: Session, user_id: int, tz: str, first: date, last: date
+) -> Events:
+    start_utc, _ = day_bounds_utc(first, tz)
+    _, end_utc = day_bounds_utc(last, tz)
+    stmt = (
+        select(ClockEvent.type, ClockEvent.ts_utc, ClockEvent.location)
+        .where(ClockEvent.user_id == user_id)
+        .where(ClockEvent.ts_utc >= start_utc)
+        .where(ClockEvent.ts_utc < end_utc)
+        .order_by(ClockEvent.ts_utc.asc())
+    )
+    return [(t, utc_datetime(ts), loc) for t, ts, loc in db.execute(stmt)]
+
+
+def _summarize_range(
+    events: Events, tz: str, first: date, last: date, now_utc: datetime
+) -> Iterator[tuple[date, DaySummary, datetime | None, datetime | None, datetime]]:
+    # (day, summary, first COME, last GO, day end) for each day with events.
+    buckets = bucket_events(
+        events, start_local=first, end_local_exclusive=last + timedelta(days=1), tz=tz
+    )
+    summaries = compute_day_summaries(
+        start_local=first,
+        end_local_exclusive=last + timedelta(days=1),
+        tz=tz,
+        events=events,
+        now_utc=now_utc,
+        buckets=buckets,
+    )
+    for k, summary in enumerate(summaries):
+        lo, hi = buckets.slice(k)
+        if lo == hi:
+            continue
+        yield (
+            buckets.day(k),
+            summary,
+            *first_come_last_go(events, lo, hi),
+            from_epoch_us(buckets.starts[k + 1]),
+        )
+
+
+# Pool worker side of _summarize_live: the summaries travel back as plain
+# tuples and epoch microseconds rather than dataclasses and datetimes.
+def _summarize_packed(
+    packed: PackedEvents, tz: str, first: date, last: date, now_utc: datetime
+) -> list[tuple[int, tuple, int | None, int | None]]:
+    return [
+        (
+            d.toordinal(),
+            astuple(summary),
+            epoch_us(first_come) if first_come else None,
+            epoch_us(last_go) if last_go else None,
+        )
+        for d, summary, first_come, last_go, _ in _summarize_range(
+            unpack_events(packed), tz, first, last, now_utc
+        )
+    ]
+
+
+def _summarize_live(
+    events: Events, tz: str, first: date, last: date, now_utc: datetime
+) -> Iterator[tuple[date, DaySummary, datetime | None, datetime | None]]:
+    # Read-side counterpart of _summarize_range. Long ranges (full history
+    # before the tables are built, year and multi-year reports) go to the
+    # report pool when it is enabled; writes never come through here.
+    if not report_pool.should_offload((last - first).days + 1):
+        for d, summary, first_come, last_go, _ in _summarize_range(
+            events, tz, first, last, now_utc
+        ):
+            yield d, summary, first_come, last_go
+        return
+    rows = report_pool.run(
+        _summarize_packed, pack_events(events), tz, first, last, now_utc
+    )
+    for ordinal, fields, first_come_us, last_go_us in rows:
+        yield (
+            date.fromordinal(ordinal),
+            DaySummary(*fields),
+            from_epoch_us(first_come_us) if first_come_us is not None else None,
+            from_epoch_us(last_go_us) if last_go_us is not None else None,
+        )
+
+
+def _row_values(
+    summary: DaySummary,
+    first_come: datetime | None,
+    last_go: datetime | None,
+    end_utc: datetime,
+    now_utc: datetime,
+) -> dict:
+    values = {f: getattr(summary, f) for f in _STORED_FIELDS}
+    values.update(
+        first_come_ts_utc=first_come,
+        last_go_ts_utc=last_go,
+        settled=not summary.has_open_interval or now_utc >= end_utc,
+        computed_at=now_utc,
+    )
+    return values
+
+
+def _add_to_rollups(totals: dict, day_local: date, values) -> None:
+    worked = values["worked_minutes"]
+    for key in ((WEEK, week_start(day_local)), (MONTH, month_start(day_local))):
+        t = totals.setdefault(key, dict.fromkeys(_PERIOD_FIELDS, 0))
+        t["worked_minutes"] += worked
+        t["break_minutes"] += values["break_minutes"]
+        t["home_minutes"] += values["home_minutes"]
+        t["office_minutes"] += values["office_minutes"]
+        if worked > 0:
+            t["worked_days"] += 1
+            if values["home_minutes"] > values["office_minutes"]:
+                t["home_office_days"] += 1
+        if not values["settled"]:
+            t["open_days"] += 1
+
+
+def _refresh_periods(db: Session, user_id: int, days: Iterable[date]) -> None:
+    keys = {(WEEK, week_start(d)) for d in days} | {
+        (MONTH, month_start(d)) for d in days
+    }
+    first = min(start for _, start in keys)
+    last = max(_period_end(period, start) for period, start in keys)
+
+    rows = db.scalars(
+        select(DaySummaryRow)
+        .where(DaySummaryRow.user_id == user_id)
+        .where(DaySummaryRow.date_local >= first)
+        .where(DaySummaryRow.date_local < last)
+    ).all()
+    totals: dict[tuple[str, date], dict] = {}
+    for row in rows:
+        values = {f: getattr(row, f) for f in (*_STORED_FIELDS, "settled")}
+        _add_to_rollups(totals, row.date_local, values)
+
+    existing = {
+        (p.period, p.period_start): p
+        for p in db.scalars(
+            select(PeriodSummary)
+            .where(PeriodSummary.user_id == user_id)
+            .where(PeriodSummary.period_start >= first)
+            .where(PeriodSummary.period_start < last)
+        ).all()
+    }
+    for key in keys:
+        period_row = existing.get(key)
+        values = totals.get(key)
+        if values is None:
+            if period_row is not None:
+                db.delete(period_row)
+            continue
+        if period_row is None:
+            period_row = PeriodSummary(
+                user_id=user_id, period=key[0], period_start=key[1]
+            )
+            db.add(period_row)
+        for f, v in values.items():
+            setattr(period_row, f, v)
+
+
+def clear_overtime_checkpoints(db: Session, *, user_id: int, since: date) -> None:
+    db.execute(
+        delete(OvertimeCheckpoint)
+        .where(OvertimeCheckpoint.user_id == user_id)
+        .where(OvertimeCheckpoint.month_start >= month_start(since))
+    )
+
+
+def summaries_ready(db: Session, user_id: int) -> bool:
+    state = db.get(UserClockState, user_id)
+    return state is None or state.day_summaries_ready
+
+
+def refresh_day_summaries(
+    db: Session,
+    *,
+    user_id: int,
+    tz: str,
+    days: Iterable[date],
+    now_utc: datetime | None = None,
+) -> None:
+    days = set(days)
+    if days:
+        clear_overtime_checkpoints(db, user_id=user_id, since=min(days))
+    # Callers rely on staged events having ids afterwards either way.
+    db.flush()
+    if not summaries_ready(db, user_id):
+        return
+    now_utc = now_utc or utc_now()
+
+    # Days whose open interval was still growing when last computed are
+    # settled by whichever write comes next.
+    days |= set(
+        db.scalars(
+            select(DaySummaryRow.date_local)
+            .where(DaySummaryRow.user_id == user_id)
+            .where(DaySummaryRow.settled.is_(False))
+        ).all()
+    )
+    if not days:
+        return
+
+    for first, last in _runs(days):
+        events = _range_events(db, user_id, tz, first, last)
+        existing = {
+            r.date_local: r
+            for r in db.scalars(
+                select(DaySummaryRow)
+                .where(DaySummaryRow.user_id == user_id)
+                .where(DaySummaryRow.date_local >= first)
+                .where(DaySummaryRow.date_local <= last)
+            ).all()
+        }
+        for d, *result in _summarize_range(events, tz, first, last, now_utc):
+            row = existing.pop(d, None)
+            if row is None:
+                row = DaySummaryRow(user_id=user_id, date_local=d)
+                db.add(row)
+            for f, v in _row_values(*result, now_utc).items():
+                setattr(row, f, v)
+        # Days left over no longer have any events.
+        for row in existing.values():
+            db.delete(row)
+
+    db.flush()
+    _refresh_periods(db, user_id, days)
+
+
+def rebuild_day_summaries(
+    db: Session, *, user_id: int, tz: str, now_utc: datetime | None = None
+) -> int:
+    now_utc = now_utc or utc_now()
+    db.execute(delete(DaySummaryRow).where(DaySummaryRow.user_id == user_id))
+    db.execute(delete(PeriodSummary).where(PeriodSummary.user_id == user_id))
+
+    stmt = (
+        select(ClockEvent.type, ClockEvent.ts_utc, ClockEvent.location)
+        .where(ClockEvent.user_id == user_id)
+        .order_by(ClockEvent.ts_utc.asc())
+        .execution_options(yield_per=5000)
+    )
+    rows: list[dict] = []
+    totals: dict[tuple[str, date], dict] = {}
+
+    def close_month(events: Events) -> None:
+        first, last = local_day(events[0][1], tz), local_day(events[-1][1], tz)
+        for day_local, *result in _summarize_range(events, tz, first, last, now_utc):
+            values = _row_values(*result, now_utc)
+            _add_to_rollups(totals, day_local, values)
+            rows.append({"user_id": user_id, "date_local": day_local, **values})
+
+    # Summarized a local month at a time so memory stays bounded.
+    month_end = None
+    events: Events = []
+    for event_type, ts_raw, location in db.execute(stmt):
+        ts = utc_datetime(ts_raw)
+        if month_end is None or epoch_us(ts) >= month_end:
+            if events:
+                close_month(events)
+            month = month_start(local_day(ts, tz))
+            month_end, events = day_start_us(next_month_start(month), tz), []
+        events.append((event_type, ts, location))
+    if events:
+        close_month(events)
+
+    if rows:
+        db.execute(DaySummaryRow.__table__.insert(), rows)
+    if totals:
+        db.execute(
+            PeriodSummary.__table__.insert(),
+            [
+                {"user_id": user_id, "period": period, "period_start": start, **values}
+                for (period, start), values in totals.items()
+            ],
+        )
+    get_clock_state(db, user_id).day_summaries_ready = True
+    return len(rows)
+
+
+def _stored_summary(row: DaySummaryRow) -> DaySummary:
+    return DaySummary(
+        date_local=row.date_local.isoformat(),
+        **{f: getattr(row, f) for f in _STORED_FIELDS},
+        rest_period_minutes=None,
+        rest_period_violation=False,
+    )
+
+
+def load_day_summaries(  # noqa: PLR0913
+    db: Session,
+    *,
+    user_id: int,
+    tz: str,
+    start_local: date,
+    end_local_exclusive: date,
+    now_utc: datetime,
+    rest_periods: bool = True,
+) -> list[DaySummary]:
+    # rest_periods=False leaves rest_period_minutes unset for callers that do
+    # not report it.
+    last = end_local_exclusive - timedelta(days=1)
+    computed: dict[date, tuple[DaySummary, datetime | None, datetime | None]] = {}
+
+    live_days: list[date] = []
+    if summaries_ready(db, user_id):
+        for row in db.scalars(
+            select(DaySummaryRow)
+            .where(DaySummaryRow.user_id == user_id)
+            .where(DaySummaryRow.date_local >= start_local)
+            .where(DaySummaryRow.date_local <= last)
+        ).all():
+            if not row.settled:
+                live_days.append(row.date_local)
+                continue
+            computed[row.date_local] = (
+                _stored_summary(row),
+                utc_datetime(row.first_come_ts_utc) if row.first_come_ts_utc else None,
+                utc_datetime(row.last_go_ts_utc) if row.last_go_ts_utc else None,
+            )
+        runs = _runs(live_days)
+    else:
+        runs = [(start_local, last)]
+
+    for first, run_last in runs:
+        events = _range_events(db, user_id, tz, first, run_last)
+        for d, summary, first_come, last_go in _summarize_live(
+            events, tz, first, run_last, now_utc
+        ):
+            computed[d] = (summary, first_come, last_go)
+
+    out: list[DaySummary] = []
+    d = start_local
+    while d <= last:
+        entry = computed.get(d)
+        if entry is None:
+            summary = compute_day_summary(
+                day_local=d, tz=tz, events=[], now_utc=now_utc
+            )
+        elif not rest_periods:
+            summary = entry[0]
+        else:
+            summary, first_come, _ = entry
+            prev = computed.get(d - timedelta(days=1))
+            last_go_prev = prev[2] if prev is not None else None
+            if last_go_prev is not None and first_come is not None:
+                rest_seconds = int((first_come - last_go_prev).total_seconds())
+                rest_minutes = max(0, rest_seconds // 60)
+                summary = replace(
+                    summary,
+                    rest_period_minutes=rest_minutes,
+                    rest_period_violation=rest_minutes < 11 * 60,
+                )
+        out.append(summary)
+        d += timedelta(days=1)
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Rebuild materialized day/week/month summaries."
+    )
+    parser.add_argument("--email", help="only rebuild this user")
+    args = parser.parse_args()
+
+    with WriteSessionLocal() as db:
+        stmt = select(User.id, User.email, User.timezone).order_by(User.id)
+        if args.email:
+            stmt = stmt.where(User.email == args.email.lower())
+        users = list(db.execute(stmt).all())
+        db.rollback()
+        if args.email and not users:
+            sys.exit(f"unknown user {args.email}")
+
+        for user_id, email, tz in users:
+            days = rebuild_day_summaries(db, user_id=user_id, tz=tz)
+            db.commit()
+            print(f"{email}: {days} days", flush=True)
+
+
+if __name__ == "__main__":
+    main()
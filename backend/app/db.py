@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import random
+import time
 from collections.abc import Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
+from app import metrics
 from app.settings import settings
 
 
@@ -14,12 +18,76 @@ def _sqlite_url() -> str:
 
 engine = create_engine(
     _sqlite_url(),
-    connect_args={"check_same_thread": False},
+    connect_args={
+        "check_same_thread": False,
+        "timeout": settings.sqlite_busy_timeout_ms / 1000,
+    },
     pool_pre_ping=True,
 )
 
+
+def is_locked_error(exc: BaseException) -> bool:
+    return isinstance(exc, OperationalError) and "database is locked" in str(exc.orig)
+
+
+def _begin_immediate(conn) -> None:
+    # A deferred transaction that reads and then writes can fail with
+    # "database is locked" immediately, without waiting out the busy timeout,
+    # when another writer got there first. Taking the write lock up front
+    # moves all waiting here, where nothing has happened yet and retrying is
+    # safe.
+    started = time.perf_counter()
+    attempt = 0
+    try:
+        while True:
+            try:
+                conn.exec_driver_sql("BEGIN IMMEDIATE")
+                return
+            except OperationalError as exc:
+                if not is_locked_error(exc):
+                    raise
+                if attempt >= settings.sqlite_lock_retries:
+                    metrics.incr("sqlite.lock_timeouts")
+                    raise
+            attempt += 1
+            metrics.incr("sqlite.lock_retries")
+            backoff_s = settings.sqlite_lock_backoff_ms / 1000 * 2**attempt
+            time.sleep(random.uniform(0, backoff_s))
+    finally:
+        metrics.incr("sqlite.write_transactions")
+        metrics.incr("sqlite.lock_wait_ms", (time.perf_counter() - started) * 1000)
+
+
+@event.listens_for(engine, "begin")
+def _begin(conn) -> None:
+    # Other transactions keep pysqlite's own handling: no BEGIN for plain
+    # reads, a deferred one before the first write.
+    if conn.get_execution_options().get("sqlite_begin") == "IMMEDIATE":
+        _begin_immediate(conn)
+
+
+def begin_write(db: Session) -> None:
+    # Request sessions only read until a handler calls this right before its
+    # read-validate-write section; from here to commit the session holds the
+    # write lock. Anything loaded earlier is expired so it is read again under
+    # the lock. A no-op once the session is already writing.
+    conn = db.connection()
+    if conn.connection.dbapi_connection.in_transaction:
+        return
+    db.expire_all()
+    _begin_immediate(conn)
+
+
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
+# For writers outside the request cycle (group commit, CLIs), which take the
+# write lock as soon as their transaction starts.
+WriteSessionLocal = sessionmaker(
+    bind=engine.execution_options(sqlite_begin="IMMEDIATE"),
+    autocommit=False,
+    autoflush=False,
+)
+
 Base = declarative_base()
 
 
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+
+
+def parse_fields(
+    fields: str | None, model: type[BaseModel], *, always: Iterable[str] = ()
+) -> frozenset[str] | None:
+    # ``fields=a,b`` query parameter -> the selected field names of ``model``
+    # (plus ``always``), or None when every field is wanted.
+    if fields is None:
+        return None
+    names = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = names - model.model_fields.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+        )
+    return frozenset(names.union(always))
+
+
+def dump_list(items: Iterable[BaseModel], fields: frozenset[str]) -> str:
+    return "[" + ",".join(item.model_dump_json(include=fields) for item in items) + "]"
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any
+
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+
+@dataclass
+class _Job:
+    fn: Callable[[Session], Any]
+    future: Future = field(default_factory=Future)
+
+
+class GroupCommitWriter:
+    """Runs write jobs from many request threads in shared transactions.
+
+    A job validates (raising HTTPException before touching the session) and
+    then stages its writes; the writer thread commits every job collected
+    within ``window_ms`` at once. If the shared commit fails, the jobs are
+    replayed one transaction each so one bad job cannot fail the others.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        *,
+        window_ms: float,
+        max_batch: int = 200,
+    ) -> None:
+        self._session_factory = session_factory
+        self._window_s = window_ms / 1000
+        self._max_batch = max_batch
+        self._queue: queue.Queue[_Job] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[[Session], Any]) -> Any:
+        self._ensure_started()
+        job = _Job(fn)
+        self._queue.put(job)
+        return job.future.result()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._loop, name="group-commit-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _loop(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self._window_s
+            while len(batch) < self._max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._commit_group(batch)
+
+    def _commit_group(self, batch: list[_Job]) -> None:
+        outcomes: list[tuple[_Job, Any, BaseException | None]] = []
+        with self._session_factory() as db:
+            try:
+                for job in batch:
+                    try:
+                        outcomes.append((job, job.fn(db), None))
+                    except HTTPException as exc:
+                        outcomes.append((job, None, exc))
+                db.commit()
+            except Exception:  # noqa: BLE001
+                db.rollback()
+                for job in batch:
+                    self._commit_single(job)
+                return
+
+        for job, value, exc in outcomes:
+            if exc is not None:
+                job.future.set_exception(exc)
+            else:
+                job.future.set_result(value)
+
+    def _commit_single(self, job: _Job) -> None:
+        with self._session_factory() as db:
+            try:
+                try:
+                    value = job.fn(db)
+                    db.commit()
+                except IntegrityError:
+                    # Lost a race on a unique key; the retry sees the winner.
+                    db.rollback()
+                    value = job.fn(db)
+                    db.commit()
+            except BaseException as exc:  # noqa: BLE001
+                db.rollback()
+                job.future.set_exception(exc)
+                return
+        job.future.set_result(value)
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+
+from app.settings import settings
+
+
+class RecentClientEvents:
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[int, str], int] = OrderedDict()
+
+    def get(self, user_id: int, client_event_id: str) -> int | None:
+        key = (user_id, client_event_id)
+        with self._lock:
+            event_id = self._entries.get(key)
+            if event_id is not None:
+                self._entries.move_to_end(key)
+            return event_id
+
+    def put(self, user_id: int, client_event_id: str, event_id: int) -> None:
+        if self._maxsize <= 0:
+            return
+        key = (user_id, client_event_id)
+        with self._lock:
+            self._entries[key] = event_id
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, user_id: int, client_event_id: str) -> None:
+        with self._lock:
+            self._entries.pop((user_id, client_event_id), None)
+
+
+recent_client_events = RecentClientEvents(settings.idempotency_cache_size)
@@ -1,11 +1,15 @@
 from __future__ import annotations
 import os
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
+from sqlalchemy.exc import OperationalError
 
+from app.data_version import NotModified
+from app.db import is_locked_error
+from app.metrics import snapshot as metrics_snapshot
 from app.settings import settings
 
 from app.routers.auth import router as auth_router
@@ -27,12 +31,31 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor"],
     )
 
+    @app.exception_handler(OperationalError)
+    async def database_locked(request: Request, exc: OperationalError):
+        if not is_locked_error(exc):
+            raise exc
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Database busy, please retry"},
+            headers={"Retry-After": "1"},
+        )
+
+    @app.exception_handler(NotModified)
+    async def not_modified(request: Request, exc: NotModified):
+        return Response(status_code=304, headers=exc.headers)
+
     @app.get("/health")
     def health() -> dict[str, str]:
         return {"status": "ok"}
 
+    @app.get("/metrics")
+    def metrics() -> dict[str, float]:
+        return metrics_snapshot()
+
     app.include_router(auth_router, prefix="/api")
     app.include_router(clock_router, prefix="/api")
     app.include_router(dashboard_router, prefix="/api")
@@ -51,7 +74,7 @@ def create_app() -> FastAPI:
 
         @app.get("/{full_path:path}")
         async def serve_spa(full_path: str, request: Request):
-            if full_path.startswith("api/") or full_path == "health":
+            if full_path.startswith("api/") or full_path in ("health", "metrics"):
                 return {"detail": "Not Found"}
             index_file = os.path.join(settings.frontend_dir, "index.html")
             if os.path.exists(index_file):
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+import threading
+from collections import defaultdict
+
+# Per-process counters; with several gunicorn workers each reports its own.
+_lock = threading.Lock()
+_counters: dict[str, float] = defaultdict(float)
+
+
+def incr(name: str, value: float = 1) -> None:
+    with _lock:
+        _counters[name] += value
+
+
+def snapshot() -> dict[str, float]:
+    with _lock:
+        return dict(sorted(_counters.items()))
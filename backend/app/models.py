@@ -2,7 +2,17 @@ from __future__ import annotations
 
 from datetime import date, datetime, UTC
 
-from sqlalchemy import Date, DateTime, Float, ForeignKey, Index, Integer, JSON, String
+from sqlalchemy import (
+    Boolean,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    JSON,
+    String,
+)
 from sqlalchemy import Enum as SAEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -26,6 +36,8 @@ class User(Base):
     email: Mapped[str] = mapped_column(String(320), unique=True, index=True)
     password_hash: Mapped[str] = mapped_column(String(255))
     token_version: Mapped[int] = mapped_column(Integer, default=0)
+    # Bumped on every write that can change reports or lists (ETag source).
+    data_version: Mapped[int] = mapped_column(Integer, default=0)
     timezone: Mapped[str] = mapped_column(String(64), default="Europe/Berlin")
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=utc_now
@@ -46,6 +58,12 @@ class User(Base):
         cascade="all, delete-orphan",
     )
 
+    clock_state: Mapped[UserClockState | None] = relationship(
+        back_populates="user",
+        cascade="all, delete-orphan",
+        uselist=False,
+    )
+
 
 class UserSettings(Base):
     __tablename__ = "user_settings"
@@ -176,6 +194,7 @@ class ClockEvent(Base):
             "client_event_id",
             unique=True,
         ),
+        Index("ix_clock_events_user_ts", "user_id", "ts_utc"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -206,6 +225,77 @@ class ClockEvent(Base):
     user: Mapped[User] = relationship()
 
 
+class UserClockState(Base):
+    __tablename__ = "user_clock_state"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    state: Mapped[str] = mapped_column(String(16), default="OFF")
+    last_event_type: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    last_event_ts_utc: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    last_go_ts_utc: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # False until day_summaries has been built from this user's full history.
+    day_summaries_ready: Mapped[bool] = mapped_column(Boolean, default=True)
+
+    user: Mapped[User] = relationship(back_populates="clock_state")
+
+
+class DaySummaryRow(Base):
+    __tablename__ = "day_summaries"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    date_local: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    worked_minutes: Mapped[int] = mapped_column(Integer)
+    break_minutes: Mapped[int] = mapped_column(Integer)
+    required_break_minutes: Mapped[int] = mapped_column(Integer)
+    required_continuous_break_minutes: Mapped[int] = mapped_column(Integer)
+    max_continuous_break_minutes: Mapped[int] = mapped_column(Integer)
+    break_compliant_total: Mapped[bool] = mapped_column(Boolean)
+    break_compliant_continuous: Mapped[bool] = mapped_column(Boolean)
+    has_open_interval: Mapped[bool] = mapped_column(Boolean)
+    home_minutes: Mapped[int] = mapped_column(Integer)
+    office_minutes: Mapped[int] = mapped_column(Integer)
+    max_daily_work_exceeded: Mapped[bool] = mapped_column(Boolean)
+
+    first_come_ts_utc: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    last_go_ts_utc: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # False while an open interval is still growing (the day has not ended).
+    settled: Mapped[bool] = mapped_column(Boolean)
+    computed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utc_now
+    )
+
+
+class PeriodSummary(Base):
+    __tablename__ = "period_summaries"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    period: Mapped[str] = mapped_column(String(8), primary_key=True)
+    period_start: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    worked_minutes: Mapped[int] = mapped_column(Integer)
+    break_minutes: Mapped[int] = mapped_column(Integer)
+    home_minutes: Mapped[int] = mapped_column(Integer)
+    office_minutes: Mapped[int] = mapped_column(Integer)
+    worked_days: Mapped[int] = mapped_column(Integer)
+    home_office_days: Mapped[int] = mapped_column(Integer)
+    open_days: Mapped[int] = mapped_column(Integer)
+
+
 class AbsenceReason(Base):
     __tablename__ = "absence_reasons"
 
@@ -278,3 +368,20 @@ class DayNote(Base):
     )
 
     user: Mapped[User] = relationship()
+
+
+class OvertimeCheckpoint(Base):
+    __tablename__ = "overtime_checkpoints"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    month_start: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    # Settings the balance was computed with; a change invalidates the ledger.
+    start_date: Mapped[date] = mapped_column(Date)
+    target_minutes: Mapped[int] = mapped_column(Integer)
+
+    # Running totals from start_date through the end of the month.
+    worked_minutes: Mapped[int] = mapped_column(Integer)
+    expected_minutes: Mapped[int] = mapped_column(Integer)
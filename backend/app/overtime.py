@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import Session
+
+from app.absence_service import absence_by_day, user_absences_in_range
+from app.day_summaries import load_day_summaries, month_start, next_month_start
+from app.db import begin_write, is_locked_error
+from app.models import OvertimeCheckpoint, User
+
+DEFAULT_TARGET_MINUTES = 468
+
+
+@dataclass(frozen=True)
+class OvertimeBalance:
+    start_date: date | None
+    as_of: date
+    worked_minutes: int
+    expected_minutes: int
+    checkpoint_month: date | None
+
+    @property
+    def balance_minutes(self) -> int:
+        return self.worked_minutes - self.expected_minutes
+
+
+def _contribution(  # noqa: PLR0913
+    db: Session,
+    *,
+    user: User,
+    start_local: date,
+    end_local_exclusive: date,
+    start_date: date | None,
+    target_minutes: int,
+    now_utc: datetime,
+) -> tuple[int, int]:
+    summaries = load_day_summaries(
+        db,
+        user_id=user.id,
+        tz=user.timezone,
+        start_local=start_local,
+        end_local_exclusive=end_local_exclusive,
+        now_utc=now_utc,
+    )
+    last = end_local_exclusive - timedelta(days=1)
+    absences = user_absences_in_range(
+        db, user_id=user.id, start_date=start_local, end_date=last
+    )
+    absent = absence_by_day(absences, start_date=start_local, end_date=last)
+
+    worked = 0
+    expected = 0
+    for summary in summaries:
+        d = date.fromisoformat(summary.date_local)
+        if start_date is not None and d < start_date:
+            continue
+        if d in absent:
+            continue
+        worked += summary.worked_minutes
+        if d.weekday() < 5:  # noqa: PLR2004
+            expected += target_minutes
+    return worked, expected
+
+
+def _latest_checkpoint(
+    db: Session, *, user_id: int, before: date, start_date: date, target_minutes: int
+) -> tuple[OvertimeCheckpoint | None, bool]:
+    # -> (checkpoint, stale); a stale ledger was written under other settings
+    # and is dropped by ``_save_ledger``.
+    checkpoint = db.scalar(
+        select(OvertimeCheckpoint)
+        .where(OvertimeCheckpoint.user_id == user_id)
+        .where(OvertimeCheckpoint.month_start < before)
+        .order_by(OvertimeCheckpoint.month_start.desc())
+        .limit(1)
+    )
+    if checkpoint is None:
+        return None, False
+    if (
+        checkpoint.start_date != start_date
+        or checkpoint.target_minutes != target_minutes
+    ):
+        return None, True
+    return checkpoint, False
+
+
+def _save_ledger(
+    db: Session,
+    *,
+    user_id: int,
+    data_version: int,
+    stale: bool,
+    checkpoints: list[OvertimeCheckpoint],
+) -> None:
+    # Checkpoints are a cache; losing a write race only costs a recompute.
+    try:
+        begin_write(db)
+        if stale:
+            # Settings changed since the ledger was written.
+            db.execute(
+                delete(OvertimeCheckpoint).where(OvertimeCheckpoint.user_id == user_id)
+            )
+        # The totals were computed from what was read at ``data_version``; an
+        # edit since then may have changed a checkpointed month, so they are
+        # only stored if the version is still the same.
+        current = db.execute(
+            update(User)
+            .where(User.id == user_id, User.data_version == data_version)
+            .values(data_version=data_version)
+            .execution_options(synchronize_session=False)
+        )
+        if current.rowcount:
+            db.add_all(checkpoints)
+        db.commit()
+    except (IntegrityError, OperationalError) as exc:
+        db.rollback()
+        if isinstance(exc, OperationalError) and not is_locked_error(exc):
+            raise
+
+
+def overtime_balance(db: Session, *, user: User, now_utc: datetime) -> OvertimeBalance:
+    data_version = user.data_version
+    today = now_utc.astimezone(ZoneInfo(user.timezone)).date()
+    current_month = month_start(today)
+    settings_row = user.settings
+    start_date = settings_row.overtime_start_date if settings_row else None
+    target = (
+        settings_row.daily_target_minutes if settings_row else DEFAULT_TARGET_MINUTES
+    )
+
+    if start_date is not None and start_date > today:
+        return OvertimeBalance(start_date, today, 0, 0, None)
+
+    # Without a start date the balance covers the current month only.
+    worked = 0
+    expected = 0
+    checkpoint_month: date | None = None
+    stale = False
+    checkpoints: list[OvertimeCheckpoint] = []
+    if start_date is not None and month_start(start_date) < current_month:
+        checkpoint, stale = _latest_checkpoint(
+            db,
+            user_id=user.id,
+            before=current_month,
+            start_date=start_date,
+            target_minutes=target,
+        )
+        if checkpoint is not None:
+            worked = checkpoint.worked_minutes
+            expected = checkpoint.expected_minutes
+            checkpoint_month = checkpoint.month_start
+            month = next_month_start(checkpoint.month_start)
+        else:
+            month = month_start(start_date)
+
+        while month < current_month:
+            month_worked, month_expected = _contribution(
+                db,
+                user=user,
+                start_local=month,
+                end_local_exclusive=next_month_start(month),
+                start_date=start_date,
+                target_minutes=target,
+                now_utc=now_utc,
+            )
+            worked += month_worked
+            expected += month_expected
+            checkpoints.append(
+                OvertimeCheckpoint(
+                    user_id=user.id,
+                    month_start=month,
+                    start_date=start_date,
+                    target_minutes=target,
+                    worked_minutes=worked,
+                    expected_minutes=expected,
+                )
+            )
+            checkpoint_month = month
+            month = next_month_start(month)
+
+    month_worked, month_expected = _contribution(
+        db,
+        user=user,
+        start_local=current_month,
+        end_local_exclusive=today + timedelta(days=1),
+        start_date=start_date,
+        target_minutes=target,
+        now_utc=now_utc,
+    )
+
+    if stale or checkpoints:
+        _save_ledger(
+            db,
+            user_id=user.id,
+            data_version=data_version,
+            stale=stale,
+            checkpoints=checkpoints,
+        )
+
+    return OvertimeBalance(
+        start_date=start_date,
+        as_of=today,
+        worked_minutes=worked + month_worked,
+        expected_minutes=expected + month_expected,
+        checkpoint_month=checkpoint_month,
+    )
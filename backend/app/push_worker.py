@@ -1,14 +1,15 @@
 from __future__ import annotations
 
 import time
-from datetime import UTC, date, datetime
+from datetime import UTC, date, datetime, timedelta
 
 from sqlalchemy import select
 
+from app.day_summaries import load_day_summaries
 from app.db import SessionLocal
 from app.models import PushNotificationLog, PushSubscription, User
 from app.push_service import send_web_push
-from app.reporting import compute_day_summary
+from app.reporting import local_day
 from app.settings import settings
 
 
@@ -48,31 +49,18 @@ def _thresholds(value: list[int] | None) -> list[int]:
     return sorted(set(out))
 
 
-def _local_day(now_utc: datetime, tz: str) -> date:
-    from zoneinfo import ZoneInfo
-
-    return now_utc.astimezone(ZoneInfo(tz)).date()
-
-
 def _compute_today_minutes(db, *, user: User, now_utc: datetime) -> tuple[date, int, int]:
     tz = user.timezone
-    day_local = _local_day(now_utc, tz)
-
-    from app.reporting import day_bounds_utc
-    from app.models import ClockEvent
-
-    start_utc, end_utc = day_bounds_utc(day_local, tz)
-    stmt = (
-        select(ClockEvent.type, ClockEvent.ts_utc, ClockEvent.location)
-        .where(ClockEvent.user_id == user.id)
-        .where(ClockEvent.ts_utc >= start_utc)
-        .where(ClockEvent.ts_utc < end_utc)
-        .order_by(ClockEvent.ts_utc.asc())
+    day_local = local_day(now_utc, tz)
+
+    (summary,) = load_day_summaries(
+        db,
+        user_id=user.id,
+        tz=tz,
+        start_local=day_local,
+        end_local_exclusive=day_local + timedelta(days=1),
+        now_utc=now_utc,
     )
-    rows = list(db.execute(stmt).all())
-    events = [(t, ts, loc) for (t, ts, loc) in rows]
-
-    summary = compute_day_summary(day_local=day_local, tz=tz, events=events, now_utc=now_utc)
     return day_local, summary.worked_minutes, summary.break_minutes
 
 
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+from app.metrics import incr
+from app.settings import settings
+
+
+class ReportCache:
+    # Reports for periods that ended before today, keyed by
+    # (user_id, kind, period_start, data_version). A write bumps the version
+    # and drops the user's entries, so entries never go stale; the TTL only
+    # bounds how long an unused entry can linger.
+    def __init__(self, maxsize: int, ttl_s: float = 0) -> None:
+        self._maxsize = maxsize
+        self._ttl_s = ttl_s
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[int, Hashable], tuple[float, Any]] = (
+            OrderedDict()
+        )
+
+    def get(self, user_id: int, key: Hashable) -> Any | None:
+        with self._lock:
+            entry = self._entries.get((user_id, key))
+            if (
+                entry is not None
+                and self._ttl_s > 0
+                and time.monotonic() - entry[0] > self._ttl_s
+            ):
+                del self._entries[(user_id, key)]
+                entry = None
+            if entry is None:
+                incr("report_cache.misses")
+                return None
+            self._entries.move_to_end((user_id, key))
+        incr("report_cache.hits")
+        return entry[1]
+
+    def put(self, user_id: int, key: Hashable, value: Any) -> None:
+        if self._maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[(user_id, key)] = (time.monotonic(), value)
+            self._entries.move_to_end((user_id, key))
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                incr("report_cache.evictions")
+
+    def discard_user(self, user_id: int) -> None:
+        with self._lock:
+            for k in [k for k in self._entries if k[0] == user_id]:
+                del self._entries[k]
+
+
+report_cache = ReportCache(settings.report_cache_size, settings.report_cache_ttl_s)
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from fastapi import Request
+from pydantic import BaseModel
+
+from app.schemas import (
+    COLUMNAR_MEDIA_TYPE,
+    AbsenceResponse,
+    ReportDay,
+    ReportDayColumns,
+)
+
+_COLUMNS = tuple(
+    f for f in ReportDayColumns.model_fields if f not in ("absence", "absences")
+)
+
+
+def _accept_quality(accept: str, media_type: str) -> float:
+    # q-value ``accept`` gives ``media_type``, taken from its most specific
+    # matching range (RFC 9110 section 12.5.1); 0 when nothing matches.
+    main_type = media_type.partition("/")[0]
+    best = (-1, 0.0)
+    for entry in accept.split(","):
+        pattern, *params = (part.strip() for part in entry.split(";"))
+        pattern = pattern.lower()
+        if pattern == media_type:
+            specificity = 2
+        elif pattern == f"{main_type}/*":
+            specificity = 1
+        elif pattern == "*/*":
+            specificity = 0
+        else:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        best = max(best, (specificity, q))
+    return best[1]
+
+
+def wants_columnar(request: Request) -> bool:
+    # Only when asked for by name and not ranked below plain JSON.
+    accept = request.headers.get("accept", "")
+    if COLUMNAR_MEDIA_TYPE not in accept.lower():
+        return False
+    q = _accept_quality(accept, COLUMNAR_MEDIA_TYPE)
+    return q > 0 and q >= _accept_quality(accept, "application/json")
+
+
+def day_columns(
+    days: Sequence[ReportDay], fields: frozenset[str] | None = None
+) -> ReportDayColumns:
+    # Only the selected columns are built when ``fields`` is given.
+    names = _COLUMNS if fields is None else [n for n in _COLUMNS if n in fields]
+    columns = {name: [getattr(day, name) for day in days] for name in names}
+    if fields is None or "absence" in fields:
+        absences: list[AbsenceResponse] = []
+        index: dict[int, int] = {}
+        refs: list[int | None] = []
+        for day in days:
+            if day.absence is None:
+                refs.append(None)
+                continue
+            i = index.get(day.absence.id)
+            if i is None:
+                i = index[day.absence.id] = len(absences)
+                absences.append(day.absence)
+            refs.append(i)
+        columns.update(absence=refs, absences=absences)
+    # The values come from validated ReportDay objects already; columns left
+    # out are simply not serialized.
+    return ReportDayColumns.model_construct(**columns)
+
+
+def columnar_json(report: BaseModel, fields: frozenset[str] | None = None) -> bytes:
+    # The report's JSON with its ``days`` list swapped for day_columns().
+    head = report.model_dump_json(exclude={"days"})
+    days = day_columns(report.days, fields).model_dump_json()
+    return f'{head[:-1]},"days":{days}}}'.encode()
+
+
+def projected_json(report: BaseModel, fields: frozenset[str]) -> str:
+    # The report's JSON with only the selected fields of each day.
+    include = dict.fromkeys(type(report).model_fields, True)
+    include["days"] = {"__all__": set(fields)}
+    return report.model_dump_json(include=include)
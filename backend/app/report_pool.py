@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import multiprocessing
+import threading
+from array import array
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from app.metrics import incr
+from app.reporting import epoch_us, from_epoch_us
+from app.settings import settings
+
+_TYPE_CODES = {"COME": "C", "BREAK_START": "S", "BREAK_END": "E", "GO": "G"}
+_TYPES = {v: k for k, v in _TYPE_CODES.items()}
+_LOCATION_CODES = {None: "-", "HOME": "H", "OFFICE": "O"}
+_LOCATIONS = {v: k for k, v in _LOCATION_CODES.items()}
+
+
+class PackedEvents(NamedTuple):
+    # A range's events as one character per type and location plus the
+    # timestamps as packed int64 epoch microseconds: three flat buffers to
+    # pickle instead of a tuple and a datetime per event.
+    types: str
+    locations: str
+    ts_us: bytes
+
+
+def pack_events(events: Sequence[tuple[str, datetime, str | None]]) -> PackedEvents:
+    return PackedEvents(
+        types="".join(_TYPE_CODES[t] for t, _, _ in events),
+        locations="".join(_LOCATION_CODES[loc] for _, _, loc in events),
+        ts_us=array("q", [epoch_us(ts) for _, ts, _ in events]).tobytes(),
+    )
+
+
+def unpack_events(packed: PackedEvents) -> list[tuple[str, datetime, str | None]]:
+    ts_us = array("q")
+    ts_us.frombytes(packed.ts_us)
+    return [
+        (_TYPES[t], from_epoch_us(ts), _LOCATIONS[loc])
+        for t, loc, ts in zip(packed.types, packed.locations, ts_us, strict=True)
+    ]
+
+
+class ReportPool:
+    # Runs pure computations over long ranges in worker processes, so their
+    # GIL time does not stall the request threads (clock-ins in particular)
+    # of the web worker. Disabled when ``workers`` is 0; work below
+    # ``min_days`` always runs inline since pickling would cost more.
+    def __init__(self, workers: int, min_days: int) -> None:
+        self._workers = workers
+        self._min_days = min_days
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def should_offload(self, days: int) -> bool:
+        return self._workers > 0 and days >= self._min_days
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        try:
+            future = self._ensure_started().submit(fn, *args)
+            result = future.result()
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); start a fresh pool next time
+            # and compute this one inline.
+            incr("report_pool.broken")
+            self.shutdown()
+            return fn(*args)
+        incr("report_pool.offloaded")
+        return result
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _ensure_started(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Forking a process that runs request threads can copy held
+                # locks into the child, so workers start fresh interpreters.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+
+report_pool = ReportPool(settings.report_pool_workers, settings.report_pool_min_days)
@@ -1,19 +1,24 @@
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import UTC, date, datetime, timedelta
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 
 from app.time_calc import (
-    as_utc,
-    gaps_between_sessions,
-    max_continuous_break_minutes,
     minutes,
     required_break_continuous_minutes,
     required_break_total_minutes,
-    seconds_between,
+    summarize_intervals,
 )
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_ONE_US = timedelta(microseconds=1)
+_US_PER_S = 1_000_000
+DAY_TABLE_CACHE_SIZE = 64
+
 
 @dataclass(frozen=True)
 class DaySummary:
@@ -34,6 +39,10 @@ class DaySummary:
     rest_period_violation: bool
 
 
+def epoch_us(ts: datetime) -> int:
+    return (ts - _EPOCH) // _ONE_US
+
+
 def iter_local_days(start_local: date, end_local_exclusive: date) -> list[date]:
     out: list[date] = []
     d = start_local
@@ -43,114 +52,84 @@ def iter_local_days(start_local: date, end_local_exclusive: date) -> list[date]:
     return out
 
 
-def day_bounds_utc(day_local: date, tz: str) -> tuple[datetime, datetime]:
-
+# Epoch microseconds of every local midnight in a year plus the next Jan 1.
+# Built through ZoneInfo, so DST days come out 23 or 25 hours long; a handful
+# of tables covers any report, so they are kept in a small LRU.
+@lru_cache(maxsize=DAY_TABLE_CACHE_SIZE)
+def _year_day_starts(tz: str, year: int) -> tuple[int, ...]:
     zone = ZoneInfo(tz)
-    start_local = datetime(day_local.year, day_local.month, day_local.day, tzinfo=zone)
-    end_local = start_local + timedelta(days=1)
-    return start_local.astimezone(UTC), end_local.astimezone(UTC)
+    d = date(year, 1, 1)
+    out: list[int] = []
+    while d.year == year:
+        out.append(epoch_us(datetime(d.year, d.month, d.day, tzinfo=zone)))
+        d += timedelta(days=1)
+    out.append(epoch_us(datetime(year + 1, 1, 1, tzinfo=zone)))
+    return tuple(out)
 
 
-def compute_day_summary(  # noqa: PLR0912, PLR0913, PLR0915
-    *,
-    day_local: date,
-    tz: str,
-    events: list[tuple[str, datetime, str | None]],
-    now_utc: datetime,
-    rest_period_minutes: int | None = None,
-    rest_period_violation: bool = False,
-) -> DaySummary:
-    start_utc, end_utc = day_bounds_utc(day_local, tz)
+def day_start_us(day_local: date, tz: str) -> int:
+    table = _year_day_starts(tz, day_local.year)
+    return table[day_local.timetuple().tm_yday - 1]
 
-    worked_seconds = 0
-    break_seconds = 0
-    home_seconds = 0
-    office_seconds = 0
 
-    open_kind: str | None = None
-    open_start: datetime | None = None
-    work_location: str | None = None
-    break_intervals: list[tuple[datetime, datetime]] = []
+def day_starts_us(start_local: date, end_local_exclusive: date, tz: str) -> list[int]:
+    # UTC start of every day in the range plus the end of the last one.
+    out: list[int] = []
+    d = start_local
+    while d < end_local_exclusive:
+        table = _year_day_starts(tz, d.year)
+        lo = d.timetuple().tm_yday - 1
+        if end_local_exclusive.year == d.year:
+            hi = end_local_exclusive.timetuple().tm_yday - 1
+        else:
+            hi = len(table) - 1
+        out.extend(table[lo:hi])
+        d = date(d.year + 1, 1, 1)
+    out.append(day_start_us(end_local_exclusive, tz))
+    return out
 
-    has_open_interval = False
 
-    for t, ts_raw, location in events:
-        ts = as_utc(ts_raw)
+def local_day(ts_utc: datetime, tz: str) -> date:
+    ts = epoch_us(ts_utc)
+    year = ts_utc.year
+    table = _year_day_starts(tz, year)
+    if ts < table[0]:
+        year -= 1
+        table = _year_day_starts(tz, year)
+    elif ts >= table[-1]:
+        year += 1
+        table = _year_day_starts(tz, year)
+    return date(year, 1, 1) + timedelta(days=bisect_right(table, ts) - 1)
+
+
+def from_epoch_us(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value)
 
-        if t == "COME":
-            open_kind = "WORK"
-            open_start = ts
-            work_location = location
-            continue
-
-        if t == "BREAK_START":
-            if open_kind == "WORK" and open_start is not None:
-                seg_seconds = seconds_between(open_start, ts)
-                worked_seconds += seg_seconds
-                if work_location == "HOME":
-                    home_seconds += seg_seconds
-                elif work_location == "OFFICE":
-                    office_seconds += seg_seconds
-            open_kind = "BREAK"
-            open_start = ts
-            continue
-
-        if t == "BREAK_END":
-            if open_kind == "BREAK" and open_start is not None:
-                seg_seconds = seconds_between(open_start, ts)
-                break_seconds += seg_seconds
-                break_intervals.append((open_start, ts))
-            open_kind = "WORK"
-            open_start = ts
-            continue
-
-        if t == "GO":
-            if open_kind == "WORK" and open_start is not None:
-                seg_seconds = seconds_between(open_start, ts)
-                worked_seconds += seg_seconds
-                if work_location == "HOME":
-                    home_seconds += seg_seconds
-                elif work_location == "OFFICE":
-                    office_seconds += seg_seconds
-            elif open_kind == "BREAK" and open_start is not None:
-                seg_seconds = seconds_between(open_start, ts)
-                break_seconds += seg_seconds
-                break_intervals.append((open_start, ts))
-            open_kind = None
-            open_start = None
-            work_location = None
-            continue
-
-    if open_kind == "WORK" and open_start is not None:
-        has_open_interval = True
-        seg_end = min(now_utc, end_utc)
-        seg_seconds = seconds_between(open_start, seg_end)
-        worked_seconds += seg_seconds
-        if work_location == "HOME":
-            home_seconds += seg_seconds
-        elif work_location == "OFFICE":
-            office_seconds += seg_seconds
-    elif open_kind == "BREAK" and open_start is not None:
-        has_open_interval = True
-        seg_end = min(now_utc, end_utc)
-        seg_seconds = seconds_between(open_start, seg_end)
-        break_seconds += seg_seconds
-        if seg_end > open_start:
-            break_intervals.append((open_start, seg_end))
-
-    event_pairs = [(t, as_utc(ts)) for (t, ts, _loc) in events]
-    gaps = gaps_between_sessions(event_pairs, start_utc=start_utc, end_utc=end_utc)
-    for s, e in gaps:
-        seg_seconds = seconds_between(s, e)
-        break_seconds += seg_seconds
-        break_intervals.append((s, e))
 
+def day_bounds_utc(day_local: date, tz: str) -> tuple[datetime, datetime]:
+    table = _year_day_starts(tz, day_local.year)
+    i = day_local.timetuple().tm_yday - 1
+    return from_epoch_us(table[i]), from_epoch_us(table[i + 1])
+
+
+def _day_summary(  # noqa: PLR0913
+    day_local: date,
+    *,
+    worked_seconds: int,
+    break_seconds: int,
+    home_seconds: int,
+    office_seconds: int,
+    max_break_seconds: int,
+    has_open_interval: bool,
+    rest_period_minutes: int | None = None,
+    rest_period_violation: bool = False,
+) -> DaySummary:
     worked_minutes = minutes(worked_seconds)
     break_minutes = minutes(break_seconds)
 
     required_break = required_break_total_minutes(worked_minutes)
     required_cont = required_break_continuous_minutes(worked_minutes)
-    max_cont = max_continuous_break_minutes(break_intervals)
+    max_cont = minutes(max_break_seconds)
 
     max_daily_work_exceeded = worked_minutes > 10 * 60
 
@@ -170,3 +149,198 @@ def compute_day_summary(  # noqa: PLR0912, PLR0913, PLR0915
         rest_period_minutes=rest_period_minutes,
         rest_period_violation=rest_period_violation,
     )
+
+
+def compute_day_summary(  # noqa: PLR0913
+    *,
+    day_local: date,
+    tz: str,
+    events: list[tuple[str, datetime, str | None]],
+    now_utc: datetime,
+    rest_period_minutes: int | None = None,
+    rest_period_violation: bool = False,
+) -> DaySummary:
+    start_utc, end_utc = day_bounds_utc(day_local, tz)
+    totals = summarize_intervals(
+        events, start_utc=start_utc, end_utc=end_utc, now_utc=now_utc
+    )
+    return _day_summary(
+        day_local,
+        worked_seconds=totals.worked_seconds,
+        break_seconds=totals.break_seconds,
+        home_seconds=totals.home_seconds,
+        office_seconds=totals.office_seconds,
+        max_break_seconds=totals.max_continuous_break_seconds,
+        has_open_interval=totals.has_open_interval,
+        rest_period_minutes=rest_period_minutes,
+        rest_period_violation=rest_period_violation,
+    )
+
+
+# Same state machine as time_calc.summarize_intervals, on integer microseconds
+# for events[lo:hi]. Floor division matches int(total_seconds()) because
+# negative segments are clamped to zero either way.
+def _summarize_day_us(  # noqa: PLR0912, PLR0913, PLR0915, PLR0917
+    events: Sequence[tuple[str, datetime, str | None]],
+    ts_us: Sequence[int],
+    lo: int,
+    hi: int,
+    start_us: int,
+    end_us: int,
+    now_us: int,
+) -> tuple[int, int, int, int, int, bool]:
+    worked = brk = home = office = max_break = 0
+    open_kind: str | None = None
+    open_start = 0
+    location: str | None = None
+    prev_type: str | None = None
+    prev_us = 0
+
+    for k in range(lo, hi):
+        t, _, loc = events[k]
+        ts = ts_us[k]
+        seg = 0
+        if open_kind is not None:
+            seg = max(0, (ts - open_start) // _US_PER_S)
+
+        if t == "COME":
+            if prev_type == "GO":
+                gap = (min(ts, end_us) - max(prev_us, start_us)) // _US_PER_S
+                if gap > 0:
+                    brk += gap
+                    max_break = max(max_break, gap)
+            open_kind = "WORK"
+            location = loc
+        elif t == "BREAK_START":
+            if open_kind == "WORK":
+                worked += seg
+                if location == "HOME":
+                    home += seg
+                elif location == "OFFICE":
+                    office += seg
+            open_kind = "BREAK"
+        elif t == "BREAK_END":
+            if open_kind == "BREAK":
+                brk += seg
+                max_break = max(max_break, seg)
+            open_kind = "WORK"
+        elif t == "GO":
+            if open_kind == "WORK":
+                worked += seg
+                if location == "HOME":
+                    home += seg
+                elif location == "OFFICE":
+                    office += seg
+            elif open_kind == "BREAK":
+                brk += seg
+                max_break = max(max_break, seg)
+            open_kind = None
+            location = None
+        open_start = ts
+        prev_type = t
+        prev_us = ts
+
+    if open_kind is not None:
+        seg = max(0, (min(now_us, end_us) - open_start) // _US_PER_S)
+        if open_kind == "WORK":
+            worked += seg
+            if location == "HOME":
+                home += seg
+            elif location == "OFFICE":
+                office += seg
+        else:
+            brk += seg
+            max_break = max(max_break, seg)
+
+    return worked, brk, home, office, max_break, open_kind is not None
+
+
+@dataclass(frozen=True)
+class DayBuckets:
+    # A range's sorted events split into local days without copying: day k
+    # is events[edges[k]:edges[k + 1]] and spans [starts[k], starts[k + 1]).
+    start_local: date
+    ts_us: list[int]
+    starts: list[int]
+    edges: list[int]
+
+    def __len__(self) -> int:
+        return len(self.starts) - 1
+
+    def day(self, k: int) -> date:
+        return self.start_local + timedelta(days=k)
+
+    def slice(self, k: int) -> tuple[int, int]:
+        return self.edges[k], self.edges[k + 1]
+
+
+def bucket_events(
+    events: Sequence[tuple[str, datetime, str | None]],
+    *,
+    start_local: date,
+    end_local_exclusive: date,
+    tz: str,
+) -> DayBuckets:
+    starts = day_starts_us(start_local, end_local_exclusive, tz)
+    ts_us = [(ts - _EPOCH) // _ONE_US for _, ts, _ in events]
+    edges = [bisect_left(ts_us, s) for s in starts]
+    return DayBuckets(start_local, ts_us, starts, edges)
+
+
+def first_come_last_go(
+    events: Sequence[tuple[str, datetime, str | None]], lo: int, hi: int
+) -> tuple[datetime | None, datetime | None]:
+    # Both are normally right at the slice edges; the scans only go further
+    # for days that continue an interval from the day before.
+    first_come = last_go = None
+    for i in range(lo, hi):
+        if events[i][0] == "COME":
+            first_come = events[i][1]
+            break
+    for i in range(hi - 1, lo - 1, -1):
+        if events[i][0] == "GO":
+            last_go = events[i][1]
+            break
+    return first_come, last_go
+
+
+# Equivalent to compute_day_summary for each day of the range, given the
+# range's sorted aware-UTC events, but every timestamp and day boundary is
+# converted to epoch microseconds once and the segment math runs on ints.
+def compute_day_summaries(  # noqa: PLR0913
+    *,
+    start_local: date,
+    end_local_exclusive: date,
+    tz: str,
+    events: Sequence[tuple[str, datetime, str | None]],
+    now_utc: datetime,
+    buckets: DayBuckets | None = None,
+) -> list[DaySummary]:
+    if buckets is None:
+        buckets = bucket_events(
+            events,
+            start_local=start_local,
+            end_local_exclusive=end_local_exclusive,
+            tz=tz,
+        )
+    starts = buckets.starts
+    now_us = epoch_us(now_utc)
+
+    out: list[DaySummary] = []
+    for k in range(len(buckets)):
+        lo, hi = buckets.slice(k)
+        worked, brk, home, office, max_break, has_open = _summarize_day_us(
+            events, buckets.ts_us, lo, hi, starts[k], starts[k + 1], now_us
+        )
+        out.append(
+            _day_summary(
+                buckets.day(k),
+                worked_seconds=worked,
+                break_seconds=brk,
+                home_seconds=home,
+                office_seconds=office,
+                max_break_seconds=max_break,
+                has_open_interval=has_open,
+            )
+        )
+    return out
@@ -9,7 +9,9 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import and_, desc, select
 from sqlalchemy.orm import Session
 
-from app.db import get_db
+from app.data_version import bump_data_version, conditional_get
+from app.day_summaries import clear_overtime_checkpoints
+from app.db import begin_write, get_db
 from app.models import Absence, AbsenceReason, ClockEvent, User
 from app.schemas import (
     AbsenceReasonResponse,
@@ -57,7 +59,11 @@ def _user_has_clock_events_in_range(
     return db.scalar(stmt) is not None
 
 
-@router.get("/reasons", response_model=list[AbsenceReasonResponse])
+@router.get(
+    "/reasons",
+    response_model=list[AbsenceReasonResponse],
+    dependencies=[Depends(conditional_get)],
+)
 def list_reasons(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -81,6 +87,7 @@ def create_reason(
     if not name:
         raise HTTPException(status_code=422, detail="name required")
 
+    begin_write(db)
     existing = db.scalar(
         select(AbsenceReason).where(
             and_(AbsenceReason.user_id == current_user.id, AbsenceReason.name == name)
@@ -91,6 +98,7 @@ def create_reason(
 
     reason = AbsenceReason(user_id=current_user.id, name=name)
     db.add(reason)
+    bump_data_version(db, current_user.id)
     db.commit()
     db.refresh(reason)
     return AbsenceReasonResponse(id=reason.id, name=reason.name)
@@ -103,6 +111,7 @@ def update_reason(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    begin_write(db)
     reason = db.get(AbsenceReason, reason_id)
     if reason is None or reason.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Not found")
@@ -120,6 +129,7 @@ def update_reason(
         raise HTTPException(status_code=409, detail="reason already exists")
 
     reason.name = name
+    bump_data_version(db, current_user.id)
     db.commit()
     db.refresh(reason)
     return AbsenceReasonResponse(id=reason.id, name=reason.name)
@@ -131,6 +141,7 @@ def delete_reason(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    begin_write(db)
     reason = db.get(AbsenceReason, reason_id)
     if reason is None or reason.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Not found")
@@ -142,10 +153,15 @@ def delete_reason(
         raise HTTPException(status_code=409, detail="reason in use")
 
     db.delete(reason)
+    bump_data_version(db, current_user.id)
     db.commit()
 
 
-@router.get("", response_model=list[AbsenceResponse])
+@router.get(
+    "",
+    response_model=list[AbsenceResponse],
+    dependencies=[Depends(conditional_get)],
+)
 def list_absences(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -190,6 +206,7 @@ def create_absence(
 ):
     _assert_valid_range(payload.start_date, payload.end_date)
 
+    begin_write(db)
     reason = db.get(AbsenceReason, payload.reason_id)
     if reason is None or reason.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="reason not found")
@@ -219,6 +236,8 @@ def create_absence(
         end_date=payload.end_date,
     )
     db.add(absence)
+    clear_overtime_checkpoints(db, user_id=current_user.id, since=payload.start_date)
+    bump_data_version(db, current_user.id)
     db.commit()
     db.refresh(absence)
 
@@ -236,9 +255,12 @@ def delete_absence(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    begin_write(db)
     absence = db.get(Absence, absence_id)
     if absence is None or absence.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Not found")
+    clear_overtime_checkpoints(db, user_id=current_user.id, since=absence.start_date)
+    bump_data_version(db, current_user.id)
     db.delete(absence)
     db.commit()
 
@@ -250,6 +272,7 @@ def update_absence(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    begin_write(db)
     absence = db.get(Absence, absence_id)
     if absence is None or absence.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Not found")
@@ -285,6 +308,10 @@ def update_absence(
     ):
         raise HTTPException(status_code=409, detail="clock events exist in range")
 
+    clear_overtime_checkpoints(
+        db, user_id=current_user.id, since=min(start_date, absence.start_date)
+    )
+    bump_data_version(db, current_user.id)
     absence.start_date = start_date
     absence.end_date = end_date
     absence.reason_id = reason_id
@@ -6,7 +6,7 @@ from fastapi import APIRouter, Cookie, Depends, HTTPException, Response, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.db import get_db
+from app.db import begin_write, get_db
 from app.models import AbsenceReason, User, UserSettings, utc_datetime, utc_now
 from app.schemas import (
     AuthResponse,
@@ -122,6 +122,9 @@ def refresh(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated"
         )
 
+    # Rotation must see the session unrevoked under the write lock, so a
+    # refresh token is only ever exchanged once.
+    begin_write(db)
     auth_session = get_valid_auth_session(db=db, refresh_token=refresh_cookie)
     if auth_session is None:
         response.delete_cookie(key="tt_refresh", path="/auth")
@@ -232,7 +235,13 @@ def confirm_password_reset(
     if len(payload.new_password) < 8:
         raise HTTPException(status_code=400, detail="Password too short")
 
-    user.password_hash = hash_password(payload.new_password)
+    # Hash before taking the write lock, then recheck the token under it.
+    password_hash = hash_password(payload.new_password)
+    begin_write(db)
+    if row.used_at is not None:
+        raise HTTPException(status_code=400, detail="Invalid token")
+
+    user.password_hash = password_hash
     user.token_version += 1
 
     stmt = select(AuthSession).where(AuthSession.user_id == user.id)
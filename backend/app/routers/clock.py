@@ -2,26 +2,61 @@
 
 from __future__ import annotations
 
+import base64
+from collections.abc import Iterator
 from datetime import UTC, date, datetime, time, timedelta
+from functools import partial
 from zoneinfo import ZoneInfo
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import desc, select
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, desc, or_, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app import metrics
+from app.clock_import import import_clock_events, parse_rows
+from app.clock_state import (
+    apply_appended_event,
+    apply_inserted_event,
+    get_clock_state,
+    rebuild_clock_state,
+)
 from app.clock_validation import validate_event_fields, validate_sequence
-from app.db import get_db
-from app.models import ClockEvent, User, utc_now
+from app.data_version import bump_data_version, conditional_get
+from app.day_summaries import refresh_day_summaries
+from app.db import WriteSessionLocal, begin_write, get_db
+from app.field_selection import dump_list, parse_fields
+from app.group_commit import GroupCommitWriter
+from app.idempotency import recent_client_events
+from app.models import Absence, ClockEvent, User, UserClockState, utc_now
 from app.schemas import (
+    ApplyClockEventEditsRequest,
+    BatchClockEventResult,
+    BatchClockEventsRequest,
+    BatchClockEventsResponse,
     ClockEventResponse,
+    ClockImportResponse,
     CreateClockEventRequest,
+    CreateClockEventResponse,
     Geo,
     UpdateClockEventRequest,
 )
 from app.security import get_current_user
+from app.settings import settings
 
-from ..absence_service import local_date_from_utc, user_has_absence_on_date
+from ..absence_service import (
+    local_date_from_utc,
+    user_absences_in_range,
+    user_has_absence_on_date,
+)
 
 router = APIRouter(prefix="/clock", tags=["clock"])
 
@@ -48,25 +83,14 @@ def _validate_payload(
     return event_type, location
 
 
-def _last_event(db: Session, user_id: int) -> ClockEvent | None:
-    stmt = (
-        select(ClockEvent)
-        .where(ClockEvent.user_id == user_id)
-        .order_by(desc(ClockEvent.ts_utc))
-        .limit(1)
-    )
-    return db.scalar(stmt)
-
-
-def _enforce_transition(last: ClockEvent | None, next_type: str) -> None:
-    if last is None:
+def _enforce_transition(last_type: str | None, next_type: str) -> None:
+    if last_type is None:
         if next_type != "COME":
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT, detail="First event must be COME"
             )
         return
 
-    last_type = last.type
     if last_type == "COME":
         if next_type in ("COME", "BREAK_END"):
             raise HTTPException(
@@ -101,32 +125,40 @@ def _enforce_transition(last: ClockEvent | None, next_type: str) -> None:
         )
 
 
-def _load_user_events(db: Session, user_id: int) -> list[ClockEvent]:
-    stmt = (
-        select(ClockEvent)
-        .where(ClockEvent.user_id == user_id)
-        .order_by(ClockEvent.ts_utc.asc())
+def _validate_neighbourhood(
+    db: Session,
+    user_id: int,
+    *,
+    points: list[datetime],
+    exclude_ids: set[int],
+    changed: list[ClockEvent],
+) -> None:
+    # Only the stored events between the nearest untouched neighbours of the
+    # changed timestamps can form new adjacent pairs; the rest of the history
+    # was valid before and stays valid.
+    lo = min(points)
+    hi = max(points)
+    base = select(ClockEvent).where(ClockEvent.user_id == user_id)
+    if exclude_ids:
+        base = base.where(ClockEvent.id.not_in(exclude_ids))
+    before = db.scalar(
+        base.where(ClockEvent.ts_utc < lo).order_by(desc(ClockEvent.ts_utc)).limit(1)
     )
-    return list(db.scalars(stmt).all())
-
-
-@router.post("/events", response_model=ClockEventResponse)
-def create_event(
-    payload: CreateClockEventRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    event_type, location = _validate_payload(payload)
+    after = db.scalar(
+        base.where(ClockEvent.ts_utc > hi).order_by(ClockEvent.ts_utc.asc()).limit(1)
+    )
+    lower = before.ts_utc if before is not None else lo
+    upper = after.ts_utc if after is not None else hi
+    stmt = base.where(ClockEvent.ts_utc >= lower).where(ClockEvent.ts_utc <= upper)
 
-    last = _last_event(db, current_user.id)
-    _enforce_transition(last, event_type)
+    window = list(db.scalars(stmt).all()) + changed
+    window.sort(key=lambda e: _as_utc(e.ts_utc))
+    validate_sequence(window, starts_history=before is None)
 
-    geo_lat = payload.geo.lat if payload.geo else None
-    geo_lng = payload.geo.lng if payload.geo else None
-    geo_acc = payload.geo.accuracy_m if payload.geo else None
 
-    now = utc_now()
-    client_ts = payload.ts_utc is not None
+def _resolve_ts(
+    payload: CreateClockEventRequest, last_ts: datetime | None, now: datetime
+) -> datetime:
     if payload.ts_utc is not None:
         candidate = payload.ts_utc
         candidate = (
@@ -146,84 +178,460 @@ def create_event(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                 detail="ts_utc too old",
             )
-        now = candidate
-    if last is not None:
-        last_ts = _as_utc(last.ts_utc)
+        return candidate
+    if last_ts is not None:
+        last_ts = _as_utc(last_ts)
         if now <= last_ts:
-            if client_ts:
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail="Event timestamp must be after last event",
-                )
             now = last_ts + timedelta(microseconds=1)
+    return now
 
-    day_local = local_date_from_utc(now, current_user.timezone)
-    absence = user_has_absence_on_date(db, user_id=current_user.id, day_local=day_local)
-    if absence is not None:
+
+def _new_event(
+    payload: CreateClockEventRequest,
+    *,
+    user_id: int,
+    ts_utc: datetime,
+    event_type: str,
+    location: str | None,
+) -> ClockEvent:
+    return ClockEvent(
+        user_id=user_id,
+        ts_utc=ts_utc,
+        type=event_type,
+        location=location,
+        geo_lat=payload.geo.lat if payload.geo else None,
+        geo_lng=payload.geo.lng if payload.geo else None,
+        geo_accuracy_m=payload.geo.accuracy_m if payload.geo else None,
+        client_event_id=payload.client_event_id,
+    )
+
+
+def _event_response(event: ClockEvent, *, geo: bool = True) -> ClockEventResponse:
+    geo_out = None
+    if geo and event.geo_lat is not None and event.geo_lng is not None:
+        geo_out = Geo(
+            lat=event.geo_lat, lng=event.geo_lng, accuracy_m=event.geo_accuracy_m
+        )
+
+    return ClockEventResponse(
+        id=event.id,
+        ts_utc=_as_utc(event.ts_utc).isoformat(),
+        type=event.type,
+        location=event.location,
+        geo=geo_out,
+        client_event_id=event.client_event_id,
+    )
+
+
+def _find_by_client_event_id(
+    db: Session, user_id: int, client_event_id: str
+) -> ClockEvent | None:
+    stmt = (
+        select(ClockEvent)
+        .where(ClockEvent.user_id == user_id)
+        .where(ClockEvent.client_event_id == client_event_id)
+        .limit(1)
+    )
+    return db.scalar(stmt)
+
+
+def _stored_retry(
+    db: Session, user_id: int, client_event_id: str
+) -> ClockEvent | None:
+    # Retries of an already stored event skip validation entirely. The LRU
+    # only remembers ids; the row is re-read so edits and deletes are seen.
+    event_id = recent_client_events.get(user_id, client_event_id)
+    if event_id is not None:
+        event = db.get(ClockEvent, event_id)
+        if (
+            event is not None
+            and event.user_id == user_id
+            and event.client_event_id == client_event_id
+        ):
+            metrics.incr("clock_events.retry_short_circuit.cache")
+            return event
+        recent_client_events.discard(user_id, client_event_id)
+
+    event = _find_by_client_event_id(db, user_id, client_event_id)
+    if event is not None:
+        recent_client_events.put(user_id, client_event_id, event.id)
+        metrics.incr("clock_events.retry_short_circuit.db")
+    return event
+
+
+def _stage_event(  # noqa: PLR0913
+    db: Session,
+    *,
+    user_id: int,
+    tz: str,
+    payload: CreateClockEventRequest,
+    clock_state: UserClockState,
+    now: datetime,
+    absences: list[Absence] | None = None,
+) -> tuple[ClockEvent, str]:
+    # Everything that can reject the event runs before the session is touched.
+    event_type, location = _validate_payload(payload)
+
+    last_ts = clock_state.last_event_ts_utc
+    late = (
+        payload.ts_utc is not None
+        and last_ts is not None
+        and _as_utc(payload.ts_utc) <= _as_utc(last_ts)
+    )
+    if not late:
+        _enforce_transition(clock_state.last_event_type, event_type)
+
+    ts = _resolve_ts(payload, last_ts, now)
+
+    day_local = local_date_from_utc(ts, tz)
+    if absences is None:
+        absent = (
+            user_has_absence_on_date(db, user_id=user_id, day_local=day_local)
+            is not None
+        )
+    else:
+        absent = any(a.start_date <= day_local <= a.end_date for a in absences)
+    if absent:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Cannot create clock events on absence days",
         )
 
-    event = ClockEvent(
-        user_id=current_user.id,
-        ts_utc=now,
-        type=event_type,
+    event = _new_event(
+        payload,
+        user_id=user_id,
+        ts_utc=ts,
+        event_type=event_type,
         location=location,
-        geo_lat=geo_lat,
-        geo_lng=geo_lng,
-        geo_accuracy_m=geo_acc,
-        client_event_id=payload.client_event_id,
     )
+    if late:
+        # A late event from another device goes in timestamp order; only the
+        # events around the insertion point need revalidating.
+        db.flush()
+        _validate_neighbourhood(
+            db, user_id, points=[ts], exclude_ids=set(), changed=[event]
+        )
+        db.add(event)
+        apply_inserted_event(clock_state, event)
+        return event, "inserted"
+
     db.add(event)
+    apply_appended_event(clock_state, event)
+    return event, "appended"
+
+
+def _created_response(event: ClockEvent, placement: str) -> CreateClockEventResponse:
+    return CreateClockEventResponse(
+        **_event_response(event).model_dump(), placement=placement
+    )
+
+
+def _group_append_job(
+    db: Session, *, user_id: int, tz: str, payload: CreateClockEventRequest
+) -> CreateClockEventResponse:
+    if payload.client_event_id is not None:
+        existing = _stored_retry(db, user_id, payload.client_event_id)
+        if existing is not None:
+            return _created_response(existing, "duplicate")
+
+    event, placement = _stage_event(
+        db,
+        user_id=user_id,
+        tz=tz,
+        payload=payload,
+        clock_state=get_clock_state(db, user_id),
+        now=utc_now(),
+    )
+    db.flush()
+    refresh_day_summaries(
+        db, user_id=user_id, tz=tz, days=[local_date_from_utc(event.ts_utc, tz)]
+    )
+    bump_data_version(db, user_id)
+    if payload.client_event_id is not None:
+        recent_client_events.put(user_id, payload.client_event_id, event.id)
+    return _created_response(event, placement)
+
+
+_group_writer: GroupCommitWriter | None = None
+
+
+def _clock_group_writer() -> GroupCommitWriter:
+    global _group_writer  # noqa: PLW0603
+    if _group_writer is None:
+        _group_writer = GroupCommitWriter(
+            WriteSessionLocal,
+            window_ms=settings.clock_group_commit_ms,
+            max_batch=settings.clock_group_commit_max_batch,
+        )
+    return _group_writer
+
+
+@router.post("/events", response_model=CreateClockEventResponse)
+def create_event(
+    payload: CreateClockEventRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if payload.client_event_id is not None:
+        existing = _stored_retry(db, current_user.id, payload.client_event_id)
+        if existing is not None:
+            return _created_response(existing, "duplicate")
+
+    if settings.clock_group_commit_ms > 0:
+        job = partial(
+            _group_append_job,
+            user_id=current_user.id,
+            tz=current_user.timezone,
+            payload=payload,
+        )
+        # The request session has only read so far and holds no lock; hand
+        # its pooled connection back before blocking on the writer.
+        db.close()
+        return _clock_group_writer().submit(job)
+
+    begin_write(db)
     try:
+        event, placement = _stage_event(
+            db,
+            user_id=current_user.id,
+            tz=current_user.timezone,
+            payload=payload,
+            clock_state=get_clock_state(db, current_user.id),
+            now=utc_now(),
+        )
+        refresh_day_summaries(
+            db,
+            user_id=current_user.id,
+            tz=current_user.timezone,
+            days=[local_date_from_utc(event.ts_utc, current_user.timezone)],
+        )
+        bump_data_version(db, current_user.id)
         db.commit()
     except IntegrityError:
         db.rollback()
         if payload.client_event_id is None:
             raise
 
-        stmt = (
-            select(ClockEvent)
-            .where(ClockEvent.user_id == current_user.id)
-            .where(ClockEvent.client_event_id == payload.client_event_id)
-            .limit(1)
+        existing = _find_by_client_event_id(
+            db, current_user.id, payload.client_event_id
         )
-        existing = db.scalar(stmt)
         if existing is None:
             raise
-        event = existing
+        event, placement = existing, "duplicate"
 
     db.refresh(event)
+    if event.client_event_id is not None:
+        recent_client_events.put(current_user.id, event.client_event_id, event.id)
+    return _created_response(event, placement)
 
-    geo_out = None
-    if event.geo_lat is not None and event.geo_lng is not None:
-        geo_out = Geo(
-            lat=event.geo_lat, lng=event.geo_lng, accuracy_m=event.geo_accuracy_m
+
+@router.post("/events:batch", response_model=BatchClockEventsResponse)
+def create_events_batch(
+    payload: BatchClockEventsRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    items = payload.events
+    if not items:
+        return BatchClockEventsResponse(results=[])
+
+    begin_write(db)
+    tz = current_user.timezone
+    now = utc_now()
+
+    keys = {p.client_event_id for p in items if p.client_event_id is not None}
+    known: dict[str, ClockEvent] = {}
+    if keys:
+        stmt = (
+            select(ClockEvent)
+            .where(ClockEvent.user_id == current_user.id)
+            .where(ClockEvent.client_event_id.in_(keys))
         )
+        for e in db.scalars(stmt).all():
+            known[e.client_event_id] = e
+
+    candidate_days = [
+        local_date_from_utc(p.ts_utc if p.ts_utc is not None else now, tz)
+        for p in items
+    ]
+    absences = user_absences_in_range(
+        db,
+        user_id=current_user.id,
+        start_date=min(candidate_days),
+        end_date=max(candidate_days) + timedelta(days=1),
+    )
 
-    return ClockEventResponse(
-        id=event.id,
-        ts_utc=_as_utc(event.ts_utc).isoformat(),
-        type=event.type,
-        location=event.location,
-        geo=geo_out,
-        client_event_id=event.client_event_id,
+    clock_state = get_clock_state(db, current_user.id)
+    outcomes: list[tuple[str, ClockEvent | None, str | None, HTTPException | None]]
+    outcomes = []
+    try:
+        for item in items:
+            key = item.client_event_id
+            if key is not None and key in known:
+                metrics.incr("clock_events.retry_short_circuit.batch")
+                outcomes.append(("duplicate", known[key], "duplicate", None))
+                continue
+
+            try:
+                event, placement = _stage_event(
+                    db,
+                    user_id=current_user.id,
+                    tz=tz,
+                    payload=item,
+                    clock_state=clock_state,
+                    now=now,
+                    absences=absences,
+                )
+            except HTTPException as exc:
+                outcomes.append(("rejected", None, None, exc))
+                continue
+
+            if key is not None:
+                known[key] = event
+            outcomes.append(("created", event, placement, None))
+
+        db.flush()
+        refresh_day_summaries(
+            db,
+            user_id=current_user.id,
+            tz=tz,
+            days={
+                local_date_from_utc(event.ts_utc, tz)
+                for outcome, event, _, _ in outcomes
+                if outcome == "created"
+            },
+        )
+        bump_data_version(db, current_user.id)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Concurrent write conflict; retry batch",
+        ) from None
+
+    results: list[BatchClockEventResult] = []
+    for outcome, event, placement, exc in outcomes:
+        if exc is not None:
+            results.append(
+                BatchClockEventResult(
+                    status=outcome, status_code=exc.status_code, detail=exc.detail
+                )
+            )
+        else:
+            results.append(
+                BatchClockEventResult(
+                    status=outcome, event=_event_response(event), placement=placement
+                )
+            )
+
+    db.commit()
+    return BatchClockEventsResponse(results=results)
+
+
+@router.post("/import", response_model=ClockImportResponse)
+def import_events(
+    file: UploadFile,
+    response: Response,
+    resume_after: datetime | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    result = import_clock_events(
+        db,
+        user=current_user,
+        rows=parse_rows(file.file),
+        resume_after=resume_after,
     )
+    if result.error is not None:
+        # The body still reports what was committed before the bad row.
+        response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    return ClockImportResponse(
+        rows_read=result.rows_read,
+        rows_imported=result.rows_imported,
+        rows_skipped=result.rows_skipped,
+        last_committed_ts_utc=result.last_committed_ts_utc.isoformat()
+        if result.last_committed_ts_utc
+        else None,
+        error_line=result.error_line,
+        error=result.error,
+    )
+
 
+def _encode_cursor(ts_utc: datetime, event_id: int) -> str:
+    raw = f"{_as_utc(ts_utc).isoformat()}|{event_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
 
-@router.get("/events", response_model=list[ClockEventResponse])
-def list_events(
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        ts_raw, id_raw = raw.split("|")
+        return _as_utc(datetime.fromisoformat(ts_raw)), int(id_raw)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Invalid cursor",
+        ) from None
+
+
+def _stream_events(
+    db: Session, stmt, fields: frozenset[str] | None = None
+) -> Iterator[str]:
+    geo = fields is None or "geo" in fields
+    columns = stmt.with_only_columns(
+        ClockEvent.id,
+        ClockEvent.ts_utc,
+        ClockEvent.type,
+        ClockEvent.location,
+        ClockEvent.client_event_id,
+        *(
+            (ClockEvent.geo_lat, ClockEvent.geo_lng, ClockEvent.geo_accuracy_m)
+            if geo
+            else ()
+        ),
+    )
+    yield "["
+    sep = ""
+    for row in db.execute(columns.execution_options(yield_per=500)):
+        yield sep + _event_response(row, geo=geo).model_dump_json(include=fields)
+        sep = ","
+    yield "]"
+
+
+def _events_json(
+    events, response: Response, fields: frozenset[str] | None
+) -> list[ClockEventResponse] | Response:
+    if fields is None:
+        return [_event_response(e) for e in events]
+    geo = "geo" in fields
+    return Response(
+        dump_list((_event_response(e, geo=geo) for e in events), fields),
+        media_type="application/json",
+        headers=dict(response.headers),
+    )
+
+
+@router.get(
+    "/events",
+    response_model=list[ClockEventResponse],
+    dependencies=[Depends(conditional_get)],
+)
+def list_events(  # noqa: PLR0912, PLR0913, PLR0917
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
-    limit: int = 50,
+    limit: int | None = None,
     start_local: str | None = None,
     end_local_exclusive: str | None = None,
+    cursor: str | None = None,
+    stream: bool = False,
+    fields: str | None = None,
 ):
-
+    selected = parse_fields(fields, ClockEventResponse)
     stmt = select(ClockEvent).where(ClockEvent.user_id == current_user.id)
 
-    if start_local is not None or end_local_exclusive is not None:
+    ranged = start_local is not None or end_local_exclusive is not None
+    if ranged:
         if start_local is None or end_local_exclusive is None:
             raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -251,34 +659,53 @@ def list_events(
         start_utc = start_dt_local.astimezone(UTC)
         end_utc = end_dt_local.astimezone(UTC)
 
-        stmt = (
-            stmt.where(ClockEvent.ts_utc >= start_utc)
-            .where(ClockEvent.ts_utc < end_utc)
-            .order_by(ClockEvent.ts_utc.asc())
+        stmt = stmt.where(ClockEvent.ts_utc >= start_utc).where(
+            ClockEvent.ts_utc < end_utc
         )
-    else:
-        limit = max(1, min(limit, 200))
-        stmt = stmt.order_by(desc(ClockEvent.ts_utc)).limit(limit)
-
-    events = list(db.scalars(stmt).all())
-
-    out: list[ClockEventResponse] = []
-    for e in events:
-        geo_out = None
-        if e.geo_lat is not None and e.geo_lng is not None:
-            geo_out = Geo(lat=e.geo_lat, lng=e.geo_lng, accuracy_m=e.geo_accuracy_m)
-
-        out.append(
-            ClockEventResponse(
-                id=e.id,
-                ts_utc=_as_utc(e.ts_utc).isoformat(),
-                type=e.type,
-                location=e.location,
-                geo=geo_out,
-                client_event_id=e.client_event_id,
+
+    # Ranges read oldest first, the recent-events view newest first; both
+    # page by keyset on (ts_utc, id).
+    if cursor is not None:
+        cursor_ts, cursor_id = _decode_cursor(cursor)
+        if ranged:
+            stmt = stmt.where(
+                or_(
+                    ClockEvent.ts_utc > cursor_ts,
+                    and_(ClockEvent.ts_utc == cursor_ts, ClockEvent.id > cursor_id),
+                )
+            )
+        else:
+            stmt = stmt.where(
+                or_(
+                    ClockEvent.ts_utc < cursor_ts,
+                    and_(ClockEvent.ts_utc == cursor_ts, ClockEvent.id < cursor_id),
+                )
             )
+    if ranged:
+        stmt = stmt.order_by(ClockEvent.ts_utc.asc(), ClockEvent.id.asc())
+    else:
+        stmt = stmt.order_by(desc(ClockEvent.ts_utc), desc(ClockEvent.id))
+
+    if stream:
+        if limit is not None:
+            stmt = stmt.limit(max(1, limit))
+        return StreamingResponse(
+            _stream_events(db, stmt, selected),
+            media_type="application/json",
+            headers=dict(response.headers),
         )
-    return out
+
+    if ranged and limit is None and cursor is None:
+        return _events_json(db.scalars(stmt), response, selected)
+
+    page_size = max(1, min(limit if limit is not None else 50, 200))
+    events = list(db.scalars(stmt.limit(page_size + 1)).all())
+    if len(events) > page_size:
+        events = events[:page_size]
+        last = events[-1]
+        response.headers["X-Next-Cursor"] = _encode_cursor(last.ts_utc, last.id)
+
+    return _events_json(events, response, selected)
 
 
 @router.delete("/events/{event_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -287,19 +714,71 @@ def delete_event(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    begin_write(db)
     event = db.get(ClockEvent, event_id)
     if event is None or event.user_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
 
-    events = _load_user_events(db, current_user.id)
-    new_events = [e for e in events if e.id != event_id]
-    new_events.sort(key=lambda e: _as_utc(e.ts_utc))
-    validate_sequence(new_events)
+    _validate_neighbourhood(
+        db,
+        current_user.id,
+        points=[_as_utc(event.ts_utc)],
+        exclude_ids={event.id},
+        changed=[],
+    )
 
+    if event.client_event_id is not None:
+        recent_client_events.discard(current_user.id, event.client_event_id)
+    day_local = local_date_from_utc(event.ts_utc, current_user.timezone)
     db.delete(event)
+    db.flush()
+    rebuild_clock_state(db, current_user.id)
+    refresh_day_summaries(
+        db, user_id=current_user.id, tz=current_user.timezone, days=[day_local]
+    )
+    bump_data_version(db, current_user.id)
     db.commit()
 
 
+def _edited_ts(value: datetime) -> datetime:
+    candidate = (
+        value.replace(tzinfo=UTC) if value.tzinfo is None else value.astimezone(UTC)
+    )
+
+    now = utc_now()
+    if candidate > now + timedelta(minutes=5):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="ts_utc cannot be in the future",
+        )
+    if candidate < now - timedelta(days=365):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="ts_utc too old",
+        )
+    return candidate
+
+
+def _apply_update(
+    event: ClockEvent,
+    *,
+    ts_utc: datetime | None,
+    event_type: str | None,
+    location: str | None,
+) -> None:
+    new_type = event_type if event_type is not None else event.type
+    if event_type is not None and event_type != "COME" and location is None:
+        new_location = None
+    else:
+        new_location = location if location is not None else event.location
+    validate_event_fields(event_type=new_type, location=new_location)
+
+    if ts_utc is not None:
+        event.ts_utc = _edited_ts(ts_utc)
+    event.type = new_type
+    event.location = new_location
+
+
 @router.put("/events/{event_id}", response_model=ClockEventResponse)
 def update_event(
     event_id: int,
@@ -307,44 +786,22 @@ def update_event(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    begin_write(db)
     event = db.get(ClockEvent, event_id)
     if event is None or event.user_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
 
-    new_type = payload.type if payload.type is not None else event.type
-    if payload.type is not None and payload.type != "COME" and payload.location is None:
-        new_location = None
-    else:
-        new_location = (
-            payload.location if payload.location is not None else event.location
-        )
-    validate_event_fields(event_type=new_type, location=new_location)
-
-    if payload.ts_utc is not None:
-        candidate = payload.ts_utc
-        candidate = (
-            candidate.replace(tzinfo=UTC)
-            if candidate.tzinfo is None
-            else candidate.astimezone(UTC)
+    old_ts = _as_utc(event.ts_utc)
+    try:
+        _apply_update(
+            event,
+            ts_utc=payload.ts_utc,
+            event_type=payload.type,
+            location=payload.location,
         )
-
-        now = utc_now()
-        if candidate > now + timedelta(minutes=5):
-            raise HTTPException(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail="ts_utc cannot be in the future",
-            )
-        if candidate < now - timedelta(days=365):
-            raise HTTPException(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail="ts_utc too old",
-            )
-        event.ts_utc = candidate
-
-    if payload.type is not None:
-        event.type = new_type
-    if payload.location is not None:
-        event.location = new_location
+    except HTTPException:
+        db.rollback()
+        raise
 
     day_local = local_date_from_utc(_as_utc(event.ts_utc), current_user.timezone)
     absence = user_has_absence_on_date(db, user_id=current_user.id, day_local=day_local)
@@ -355,28 +812,140 @@ def update_event(
             detail="Cannot update clock events on absence days",
         )
 
-    events = _load_user_events(db, current_user.id)
-    events.sort(key=lambda e: _as_utc(e.ts_utc))
     try:
-        validate_sequence(events)
+        _validate_neighbourhood(
+            db,
+            current_user.id,
+            points=[old_ts, _as_utc(event.ts_utc)],
+            exclude_ids={event.id},
+            changed=[event],
+        )
     except HTTPException:
         db.rollback()
         raise
 
+    db.flush()
+    rebuild_clock_state(db, current_user.id)
+    refresh_day_summaries(
+        db,
+        user_id=current_user.id,
+        tz=current_user.timezone,
+        days={
+            local_date_from_utc(ts, current_user.timezone)
+            for ts in (old_ts, event.ts_utc)
+        },
+    )
+    bump_data_version(db, current_user.id)
     db.commit()
     db.refresh(event)
+    return _event_response(event)
 
-    geo_out = None
-    if event.geo_lat is not None and event.geo_lng is not None:
-        geo_out = Geo(
-            lat=event.geo_lat, lng=event.geo_lng, accuracy_m=event.geo_accuracy_m
+
+@router.post("/events:apply", response_model=list[ClockEventResponse])
+def apply_event_edits(  # noqa: PLR0912, PLR0915
+    payload: ApplyClockEventEditsRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    user_id = current_user.id
+
+    ids = [edit.id for edit in payload.edits if edit.op != "create"]
+    if any(i is None for i in ids):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="id required for update and delete",
+        )
+    if len(set(ids)) != len(ids):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Each event may only be edited once",
         )
 
-    return ClockEventResponse(
-        id=event.id,
-        ts_utc=_as_utc(event.ts_utc).isoformat(),
-        type=event.type,
-        location=event.location,
-        geo=geo_out,
-        client_event_id=event.client_event_id,
+    begin_write(db)
+    stored: dict[int, ClockEvent] = {}
+    if ids:
+        stmt = (
+            select(ClockEvent)
+            .where(ClockEvent.user_id == user_id)
+            .where(ClockEvent.id.in_(ids))
+        )
+        stored = {e.id: e for e in db.scalars(stmt).all()}
+    if len(stored) != len(ids):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+
+    # Apply everything in memory; only the final state is validated.
+    points = [_as_utc(e.ts_utc) for e in stored.values()]
+    changed: list[ClockEvent] = []
+    created: list[ClockEvent] = []
+    deleted: list[ClockEvent] = []
+    try:
+        for edit in payload.edits:
+            if edit.op == "delete":
+                deleted.append(stored[edit.id])
+                continue
+
+            if edit.op == "create":
+                if edit.type is None:
+                    raise HTTPException(
+                        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                        detail="type required for create",
+                    )
+                validate_event_fields(event_type=edit.type, location=edit.location)
+                event = ClockEvent(
+                    user_id=user_id,
+                    ts_utc=_edited_ts(edit.ts_utc)
+                    if edit.ts_utc is not None
+                    else utc_now(),
+                    type=edit.type,
+                    location=edit.location,
+                )
+                created.append(event)
+            else:
+                event = stored[edit.id]
+                _apply_update(
+                    event,
+                    ts_utc=edit.ts_utc,
+                    event_type=edit.type,
+                    location=edit.location,
+                )
+            changed.append(event)
+            points.append(_as_utc(event.ts_utc))
+
+        tz = current_user.timezone
+        days = {local_date_from_utc(_as_utc(e.ts_utc), tz) for e in changed}
+        if days:
+            absences = user_absences_in_range(
+                db, user_id=user_id, start_date=min(days), end_date=max(days)
+            )
+            if any(a.start_date <= d <= a.end_date for a in absences for d in days):
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Cannot update clock events on absence days",
+                )
+
+        _validate_neighbourhood(
+            db,
+            user_id,
+            points=points,
+            exclude_ids=set(stored),
+            changed=changed,
+        )
+    except HTTPException:
+        db.rollback()
+        raise
+
+    for event in deleted:
+        if event.client_event_id is not None:
+            recent_client_events.discard(user_id, event.client_event_id)
+        db.delete(event)
+    db.add_all(created)
+    db.flush()
+    rebuild_clock_state(db, user_id)
+    refresh_day_summaries(
+        db, user_id=user_id, tz=tz, days={local_date_from_utc(p, tz) for p in points}
     )
+    bump_data_version(db, user_id)
+
+    out = [_event_response(e) for e in changed]
+    db.commit()
+    return out
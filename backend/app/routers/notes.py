@@ -6,7 +6,8 @@ from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy import and_, select
 from sqlalchemy.orm import Session
 
-from app.db import get_db
+from app.data_version import bump_data_version, conditional_get
+from app.db import begin_write, get_db
 from app.models import DayNote, User, utc_now
 from app.schemas import DayNoteResponse, UpsertDayNoteRequest
 from app.security import get_current_user
@@ -49,6 +50,7 @@ def upsert_note(
     if payload.content.strip() == "":
         raise HTTPException(status_code=422, detail="content must not be empty")
 
+    begin_write(db)
     stmt = (
         select(DayNote)
         .where(DayNote.user_id == current_user.id)
@@ -68,6 +70,7 @@ def upsert_note(
         note.content = payload.content
         note.updated_at = utc_now()
 
+    bump_data_version(db, current_user.id)
     db.commit()
     db.refresh(note)
 
@@ -85,6 +88,7 @@ def delete_note(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    begin_write(db)
     stmt = (
         select(DayNote)
         .where(DayNote.user_id == current_user.id)
@@ -96,11 +100,16 @@ def delete_note(
         return Response(status_code=204)
 
     db.delete(note)
+    bump_data_version(db, current_user.id)
     db.commit()
     return Response(status_code=204)
 
 
-@router.get("", response_model=list[str])
+@router.get(
+    "",
+    response_model=list[str],
+    dependencies=[Depends(conditional_get)],
+)
 def list_note_days(
     start: date,
     end_exclusive: date,
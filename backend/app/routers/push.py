@@ -8,7 +8,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.db import get_db
+from app.db import begin_write, get_db
 from app.models import PushSubscription, User
 from app.schemas import (
     PushSubscriptionRequest,
@@ -37,6 +37,7 @@ def subscribe(
     lang = (payload.lang or "en").strip() or "en"
     lang = "de" if lang.lower().startswith("de") else "en"
 
+    begin_write(db)
     existing = db.scalar(
         select(PushSubscription)
         .where(PushSubscription.endpoint == payload.endpoint)
@@ -70,6 +71,7 @@ def unsubscribe(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> dict[str, str]:
+    begin_write(db)
     sub = db.scalar(
         select(PushSubscription)
         .where(PushSubscription.user_id == current_user.id)
@@ -2,83 +2,93 @@
 
 from __future__ import annotations
 
+import json
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
 from datetime import date, datetime, timedelta, UTC
+from functools import partial
+from itertools import chain
 
 from zoneinfo import ZoneInfo
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 from sqlalchemy import and_, select
 from sqlalchemy.orm import Session
 
+from app.absence_service import absence_by_day
+from app.data_version import conditional_get, conditional_get_columnar
+from app.day_summaries import load_day_summaries
 from app.db import get_db
-from app.models import Absence, AbsenceReason, ClockEvent, DayNote, User
-from app.reporting import compute_day_summary, day_bounds_utc, iter_local_days
+from app.field_selection import parse_fields
+from app.models import Absence, AbsenceReason, DayNote, User
+from app.overtime import overtime_balance
+from app.report_cache import report_cache
+from app.report_encoding import columnar_json, projected_json, wants_columnar
+from app.reporting import iter_local_days, local_day
 from app.schemas import (
+    COLUMNAR_MEDIA_TYPE,
     AbsenceReasonResponse,
     AbsenceResponse,
     MonthReportResponse,
+    OvertimeResponse,
+    RangeReportResponse,
     ReportDay,
     WeekReportResponse,
+    YearReportMonth,
+    YearReportResponse,
 )
 from app.security import get_current_user
+from app.single_flight import report_flights
 
 
-def _as_utc(value: datetime) -> datetime:
-    if value.tzinfo is None:
-        return value.replace(tzinfo=UTC)
-    return value.astimezone(UTC)
+router = APIRouter(prefix="/reports", tags=["reports"])
 
+RANGE_MAX_DAYS = 366 * 10
+RANGE_CHUNK_DAYS = 31
 
-router = APIRouter(prefix="/reports", tags=["reports"])
+_REST_PERIOD_FIELDS = {"rest_period_minutes", "rest_period_violation"}
 
 
 def _week_start(d: date) -> date:
     return d - timedelta(days=d.weekday())
 
 
-@router.get("/week", response_model=WeekReportResponse)
-def week_report(  # noqa: PLR0915
-    start: str | None = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    tz = current_user.timezone
-    zone = ZoneInfo(tz)
-    today_local = datetime.now(UTC).astimezone(zone).date()
-    week_start = (
-        _week_start(today_local) if start is None else date.fromisoformat(start)
-    )
-    week_start = _week_start(week_start)
-    week_end = week_start + timedelta(days=7)
-
-    if week_end < week_start:
-        raise HTTPException(status_code=422, detail="Invalid date")
-
-    start_utc, _end_utc_day = day_bounds_utc(week_start, tz)
-    end_utc, _end_utc_day2 = day_bounds_utc(week_end, tz)
-
-    stmt = (
-        select(ClockEvent)
-        .where(ClockEvent.user_id == current_user.id)
-        .where(and_(ClockEvent.ts_utc >= start_utc, ClockEvent.ts_utc < end_utc))
-        .order_by(ClockEvent.ts_utc.asc())
-    )
-    events = list(db.scalars(stmt).all())
-
-    abs_stmt = (
-        select(Absence)
-        .where(Absence.user_id == current_user.id)
-        .where(Absence.start_date < week_end)
-        .where(Absence.end_date >= week_start)
-    )
-    absences = list(db.scalars(abs_stmt).all())
-
-    note_stmt = (
-        select(DayNote.date_local)
-        .where(DayNote.user_id == current_user.id)
-        .where(and_(DayNote.date_local >= week_start, DayNote.date_local < week_end))
-    )
-    note_days = {d.isoformat() for d in db.execute(note_stmt).scalars().all()}
+def _report_days(  # noqa: PLR0913
+    db: Session,
+    *,
+    user: User,
+    start_local: date,
+    end_local_exclusive: date,
+    now_utc: datetime,
+    fields: frozenset[str] | None = None,
+) -> list[ReportDay]:
+    # With a field selection, absences, notes and rest periods are only looked
+    # up when selected; the other fields keep their defaults.
+    absences: list[Absence] = []
+    if fields is None or "absence" in fields:
+        abs_stmt = (
+            select(Absence)
+            .where(Absence.user_id == user.id)
+            .where(Absence.start_date < end_local_exclusive)
+            .where(Absence.end_date >= start_local)
+        )
+        absences = list(db.scalars(abs_stmt).all())
+
+    note_days: set[str] = set()
+    if fields is None or "has_note" in fields:
+        note_stmt = (
+            select(DayNote.date_local)
+            .where(DayNote.user_id == user.id)
+            .where(
+                and_(
+                    DayNote.date_local >= start_local,
+                    DayNote.date_local < end_local_exclusive,
+                )
+            )
+        )
+        note_days = {d.isoformat() for d in db.execute(note_stmt).scalars().all()}
     reason_ids = {a.reason_id for a in absences}
     reasons: dict[int, AbsenceReason] = {}
     if reason_ids:
@@ -87,61 +97,38 @@ def week_report(  # noqa: PLR0915
         ).all():
             reasons[r.id] = r
 
-    first_come_ts: dict[str, datetime] = {}
-    last_go_ts: dict[str, datetime] = {}
-    for e in events:
-        ts = _as_utc(e.ts_utc)
-        local_key = ts.astimezone(zone).date().isoformat()
-        if e.type == "COME":
-            existing = first_come_ts.get(local_key)
-            first_come_ts[local_key] = ts if existing is None else min(existing, ts)
-        elif e.type == "GO":
-            existing = last_go_ts.get(local_key)
-            last_go_ts[local_key] = ts if existing is None else max(existing, ts)
-
-    by_day: dict[str, list[tuple[str, datetime, str | None]]] = {}
-    for e in events:
-        local_date = e.ts_utc.astimezone(zone).date()
-        key = local_date.isoformat()
-        by_day.setdefault(key, []).append((e.type, e.ts_utc, e.location))
-
-    now_utc = datetime.now(UTC)
-    days: list[ReportDay] = []
-    total_worked = 0
-    total_break = 0
-    for d in iter_local_days(week_start, week_end):
-        prev_day = (d - timedelta(days=1)).isoformat()
-        last_go_prev = last_go_ts.get(prev_day)
-        first_come_today = first_come_ts.get(d.isoformat())
-
-        rest_minutes: int | None = None
-        rest_violation = False
-        if last_go_prev is not None and first_come_today is not None:
-            rest_seconds = int((first_come_today - last_go_prev).total_seconds())
-            rest_minutes = max(0, rest_seconds // 60)
-            rest_violation = rest_minutes < 11 * 60
-
-        summary = compute_day_summary(
-            day_local=d,
-            tz=tz,
-            events=by_day.get(d.isoformat(), []),
-            now_utc=now_utc,
-            rest_period_minutes=rest_minutes,
-            rest_period_violation=rest_violation,
+    absence_out: dict[int, AbsenceResponse | None] = {}
+    for a in absences:
+        r = reasons.get(a.reason_id)
+        absence_out[a.id] = (
+            AbsenceResponse(
+                id=a.id,
+                start_date=a.start_date.isoformat(),
+                end_date=a.end_date.isoformat(),
+                reason=AbsenceReasonResponse(id=r.id, name=r.name),
+            )
+            if r is not None
+            else None
         )
+    absent = absence_by_day(
+        absences,
+        start_date=start_local,
+        end_date=end_local_exclusive - timedelta(days=1),
+    )
 
-        absence_out: AbsenceResponse | None = None
-        for a in absences:
-            if a.start_date <= d <= a.end_date:
-                r = reasons.get(a.reason_id)
-                if r is not None:
-                    absence_out = AbsenceResponse(
-                        id=a.id,
-                        start_date=a.start_date.isoformat(),
-                        end_date=a.end_date.isoformat(),
-                        reason=AbsenceReasonResponse(id=r.id, name=r.name),
-                    )
-                break
+    summaries = load_day_summaries(
+        db,
+        user_id=user.id,
+        tz=user.timezone,
+        start_local=start_local,
+        end_local_exclusive=end_local_exclusive,
+        now_utc=now_utc,
+        rest_periods=fields is None or not _REST_PERIOD_FIELDS.isdisjoint(fields),
+    )
+    days: list[ReportDay] = []
+    local_days = iter_local_days(start_local, end_local_exclusive)
+    for d, summary in zip(local_days, summaries, strict=True):
+        absence = absent.get(d)
         days.append(
             ReportDay(
                 date_local=summary.date_local,
@@ -158,29 +145,284 @@ def week_report(  # noqa: PLR0915
                 max_daily_work_exceeded=summary.max_daily_work_exceeded,
                 rest_period_minutes=summary.rest_period_minutes,
                 rest_period_violation=summary.rest_period_violation,
-                absence=absence_out,
+                absence=absence_out[absence.id] if absence is not None else None,
                 has_note=summary.date_local in note_days,
             )
         )
-        total_worked += summary.worked_minutes
-        total_break += summary.break_minutes
+    return days
+
+
+@dataclass
+class _Totals:
+    worked_minutes: int = 0
+    break_minutes: int = 0
+    worked_days: int = 0
+    home_office_days: int = 0
+
+    def add(self, day: ReportDay) -> None:
+        self.worked_minutes += day.worked_minutes
+        self.break_minutes += day.break_minutes
+        if day.worked_minutes > 0:
+            self.worked_days += 1
+            if day.home_minutes > day.office_minutes:
+                self.home_office_days += 1
+
+    @property
+    def home_office_ratio(self) -> float:
+        if self.worked_days == 0:
+            return 0.0
+        return self.home_office_days / self.worked_days
+
+
+def _totals(days: Iterable[ReportDay]) -> _Totals:
+    totals = _Totals()
+    for day in days:
+        totals.add(day)
+    return totals
+
+
+def _iter_report_days(  # noqa: PLR0913
+    db: Session,
+    *,
+    user: User,
+    start_local: date,
+    end_local_exclusive: date,
+    now_utc: datetime,
+    chunk_days: int | None = None,
+    fields: frozenset[str] | None = None,
+) -> Iterator[ReportDay]:
+    # Chunks overlap by one day so every day's rest period still sees the day
+    # before it, exactly as in a single pass over the range.
+    if chunk_days is None:
+        chunk_days = (end_local_exclusive - start_local).days
+    start = start_local
+    while start < end_local_exclusive:
+        end = min(start + timedelta(days=chunk_days), end_local_exclusive)
+        lead = start - timedelta(days=1) if start > start_local else start
+        days = _report_days(
+            db,
+            user=user,
+            start_local=lead,
+            end_local_exclusive=end,
+            now_utc=now_utc,
+            fields=fields,
+        )
+        yield from days[(start - lead).days :]
+        start = end
+
+
+def _parse_day_fields(fields: str | None) -> frozenset[str] | None:
+    return parse_fields(fields, ReportDay, always=("date_local",))
+
+
+def _home_office_target_ratio(user: User) -> float:
+    return user.settings.home_office_target_ratio if user.settings else 0.4
+
+
+def _report(  # noqa: PLR0913
+    user: User,
+    kind: str,
+    period: date | int,
+    *,
+    closed: bool,
+    fields: frozenset[str] | None,
+    build: Callable[[], BaseModel],
+) -> BaseModel:
+    # Closed periods come from the LRU; everything else is computed at most
+    # once at a time per user, period, field selection and data version.
+    key = (kind, period, fields, user.data_version)
+    cached = report_cache.get(user.id, key) if closed else None
+    if cached is not None:
+        return cached
+    out = report_flights.run((user.id, *key), build)
+    if closed:
+        report_cache.put(user.id, key, out)
+    return out
+
+
+def _negotiate(
+    request: Request,
+    response: Response,
+    report: BaseModel,
+    fields: frozenset[str] | None,
+):
+    # Week, month and year reports can also be sent with columnar days.
+    if wants_columnar(request):
+        return Response(
+            columnar_json(report, fields),
+            media_type=COLUMNAR_MEDIA_TYPE,
+            headers=dict(response.headers),
+        )
+    if fields is None:
+        return report
+    return Response(
+        projected_json(report, fields),
+        media_type="application/json",
+        headers=dict(response.headers),
+    )
+
+
+def _week_response(
+    db: Session,
+    user: User,
+    week_start: date,
+    week_end: date,
+    fields: frozenset[str] | None = None,
+) -> WeekReportResponse:
+    days = list(
+        _iter_report_days(
+            db,
+            user=user,
+            start_local=week_start,
+            end_local_exclusive=week_end,
+            now_utc=datetime.now(UTC),
+            fields=fields,
+        )
+    )
+    totals = _totals(days)
 
     return WeekReportResponse(
         week_start_local=week_start.isoformat(),
         week_end_local_exclusive=week_end.isoformat(),
-        timezone=tz,
-        total_worked_minutes=total_worked,
-        total_break_minutes=total_break,
+        timezone=user.timezone,
+        total_worked_minutes=totals.worked_minutes,
+        total_break_minutes=totals.break_minutes,
         days=days,
     )
 
 
-@router.get("/month", response_model=MonthReportResponse)
-def month_report(  # noqa: PLR0912, PLR0915
+def _month_response(
+    db: Session,
+    user: User,
+    month_start: date,
+    month_end: date,
+    fields: frozenset[str] | None = None,
+) -> MonthReportResponse:
+    days = list(
+        _iter_report_days(
+            db,
+            user=user,
+            start_local=month_start,
+            end_local_exclusive=month_end,
+            now_utc=datetime.now(UTC),
+            fields=fields,
+        )
+    )
+    totals = _totals(days)
+
+    return MonthReportResponse(
+        month_start_local=month_start.isoformat(),
+        month_end_local_exclusive=month_end.isoformat(),
+        timezone=user.timezone,
+        total_worked_minutes=totals.worked_minutes,
+        total_break_minutes=totals.break_minutes,
+        worked_days=totals.worked_days,
+        home_office_days=totals.home_office_days,
+        home_office_ratio=totals.home_office_ratio,
+        home_office_target_ratio=_home_office_target_ratio(user),
+        days=days,
+    )
+
+
+def _year_response(
+    db: Session, user: User, year: int, fields: frozenset[str] | None = None
+) -> YearReportResponse:
+    days = list(
+        _iter_report_days(
+            db,
+            user=user,
+            start_local=date(year, 1, 1),
+            end_local_exclusive=date(year + 1, 1, 1),
+            now_utc=datetime.now(UTC),
+            fields=fields,
+        )
+    )
+
+    totals = _Totals()
+    by_month: dict[str, _Totals] = {}
+    for day in days:
+        totals.add(day)
+        by_month.setdefault(day.date_local[:7], _Totals()).add(day)
+
+    months = [
+        YearReportMonth(
+            month_start_local=f"{key}-01",
+            total_worked_minutes=t.worked_minutes,
+            total_break_minutes=t.break_minutes,
+            worked_days=t.worked_days,
+            home_office_days=t.home_office_days,
+            home_office_ratio=t.home_office_ratio,
+        )
+        for key, t in by_month.items()
+    ]
+
+    return YearReportResponse(
+        year=year,
+        timezone=user.timezone,
+        total_worked_minutes=totals.worked_minutes,
+        total_break_minutes=totals.break_minutes,
+        worked_days=totals.worked_days,
+        home_office_days=totals.home_office_days,
+        home_office_ratio=totals.home_office_ratio,
+        home_office_target_ratio=_home_office_target_ratio(user),
+        months=months,
+        days=days,
+    )
+
+
+@router.get(
+    "/week",
+    response_model=WeekReportResponse,
+    dependencies=[Depends(conditional_get_columnar)],
+)
+def week_report(  # noqa: PLR0913, PLR0917
+    request: Request,
+    response: Response,
+    start: str | None = None,
+    fields: str | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    selected = _parse_day_fields(fields)
+    tz = current_user.timezone
+    zone = ZoneInfo(tz)
+    today_local = datetime.now(UTC).astimezone(zone).date()
+    week_start = (
+        _week_start(today_local) if start is None else date.fromisoformat(start)
+    )
+    week_start = _week_start(week_start)
+    week_end = week_start + timedelta(days=7)
+
+    if week_end < week_start:
+        raise HTTPException(status_code=422, detail="Invalid date")
+
+    report = _report(
+        current_user,
+        "week",
+        week_start,
+        closed=week_end <= today_local,
+        fields=selected,
+        build=partial(
+            _week_response, db, current_user, week_start, week_end, selected
+        ),
+    )
+    return _negotiate(request, response, report, selected)
+
+
+@router.get(
+    "/month",
+    response_model=MonthReportResponse,
+    dependencies=[Depends(conditional_get_columnar)],
+)
+def month_report(  # noqa: PLR0913, PLR0917
+    request: Request,
+    response: Response,
     month: str | None = None,
+    fields: str | None = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    selected = _parse_day_fields(fields)
     tz = current_user.timezone
     zone = ZoneInfo(tz)
 
@@ -200,138 +442,157 @@ def month_report(  # noqa: PLR0912, PLR0915
     month_start = date(year, mon, 1)
     month_end = date(year + 1, 1, 1) if mon == 12 else date(year, mon + 1, 1)  # noqa: PLR2004
 
-    start_utc, _ = day_bounds_utc(month_start, tz)
-    end_utc, _ = day_bounds_utc(month_end, tz)
-
-    stmt = (
-        select(ClockEvent)
-        .where(ClockEvent.user_id == current_user.id)
-        .where(and_(ClockEvent.ts_utc >= start_utc, ClockEvent.ts_utc < end_utc))
-        .order_by(ClockEvent.ts_utc.asc())
+    report = _report(
+        current_user,
+        "month",
+        month_start,
+        closed=month_end <= today_local,
+        fields=selected,
+        build=partial(
+            _month_response, db, current_user, month_start, month_end, selected
+        ),
     )
-    events = list(db.scalars(stmt).all())
+    return _negotiate(request, response, report, selected)
 
-    abs_stmt = (
-        select(Absence)
-        .where(Absence.user_id == current_user.id)
-        .where(Absence.start_date < month_end)
-        .where(Absence.end_date >= month_start)
-    )
-    absences = list(db.scalars(abs_stmt).all())
 
-    note_stmt = (
-        select(DayNote.date_local)
-        .where(DayNote.user_id == current_user.id)
-        .where(and_(DayNote.date_local >= month_start, DayNote.date_local < month_end))
+@router.get(
+    "/year",
+    response_model=YearReportResponse,
+    dependencies=[Depends(conditional_get_columnar)],
+)
+def year_report(  # noqa: PLR0913, PLR0917
+    request: Request,
+    response: Response,
+    year: int | None = None,
+    fields: str | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    selected = _parse_day_fields(fields)
+    tz = current_user.timezone
+    today_local = datetime.now(UTC).astimezone(ZoneInfo(tz)).date()
+    if year is None:
+        year = today_local.year
+    if year < 1 or year >= 9999:  # noqa: PLR2004
+        raise HTTPException(status_code=422, detail="Invalid year")
+
+    report = _report(
+        current_user,
+        "year",
+        year,
+        closed=year < today_local.year,
+        fields=selected,
+        build=partial(_year_response, db, current_user, year, selected),
     )
-    note_days = {d.isoformat() for d in db.execute(note_stmt).scalars().all()}
-    reason_ids = {a.reason_id for a in absences}
-    reasons: dict[int, AbsenceReason] = {}
-    if reason_ids:
-        for r in db.scalars(
-            select(AbsenceReason).where(AbsenceReason.id.in_(reason_ids))
-        ).all():
-            reasons[r.id] = r
-
-    first_come_ts: dict[str, datetime] = {}
-    last_go_ts: dict[str, datetime] = {}
-    for e in events:
-        ts = _as_utc(e.ts_utc)
-        local_key = ts.astimezone(zone).date().isoformat()
-        if e.type == "COME":
-            existing = first_come_ts.get(local_key)
-            first_come_ts[local_key] = ts if existing is None else min(existing, ts)
-        elif e.type == "GO":
-            existing = last_go_ts.get(local_key)
-            last_go_ts[local_key] = ts if existing is None else max(existing, ts)
-
-    by_day: dict[str, list[tuple[str, datetime, str | None]]] = {}
-    for e in events:
-        local_date = e.ts_utc.astimezone(zone).date()
-        key = local_date.isoformat()
-        by_day.setdefault(key, []).append((e.type, e.ts_utc, e.location))
-
-    now_utc = datetime.now(UTC)
-    days: list[ReportDay] = []
-    total_worked = 0
-    total_break = 0
-    worked_days = 0
-    home_office_days = 0
-
-    for d in iter_local_days(month_start, month_end):
-        prev_day = (d - timedelta(days=1)).isoformat()
-        last_go_prev = last_go_ts.get(prev_day)
-        first_come_today = first_come_ts.get(d.isoformat())
-
-        rest_minutes: int | None = None
-        rest_violation = False
-        if last_go_prev is not None and first_come_today is not None:
-            rest_seconds = int((first_come_today - last_go_prev).total_seconds())
-            rest_minutes = max(0, rest_seconds // 60)
-            rest_violation = rest_minutes < 11 * 60
-
-        summary = compute_day_summary(
-            day_local=d,
-            tz=tz,
-            events=by_day.get(d.isoformat(), []),
-            now_utc=now_utc,
-            rest_period_minutes=rest_minutes,
-            rest_period_violation=rest_violation,
+    return _negotiate(request, response, report, selected)
+
+
+def _stream_range_report(
+    *,
+    user: User,
+    start_local: date,
+    end_local_exclusive: date,
+    days: Iterable[ReportDay],
+    fields: frozenset[str] | None = None,
+) -> Iterator[str]:
+    head = {
+        "start_local": start_local.isoformat(),
+        "end_local_exclusive": end_local_exclusive.isoformat(),
+        "timezone": user.timezone,
+    }
+    yield json.dumps(head, separators=(",", ":"))[:-1] + ',"days":['
+    totals = _Totals()
+    sep = ""
+    for day in days:
+        totals.add(day)
+        yield sep + day.model_dump_json(include=fields)
+        sep = ","
+    tail = {
+        "total_worked_minutes": totals.worked_minutes,
+        "total_break_minutes": totals.break_minutes,
+        "worked_days": totals.worked_days,
+        "home_office_days": totals.home_office_days,
+        "home_office_ratio": totals.home_office_ratio,
+    }
+    yield "]," + json.dumps(tail, separators=(",", ":"))[1:]
+
+
+@router.get(
+    "/range",
+    response_model=RangeReportResponse,
+    dependencies=[Depends(conditional_get)],
+)
+def range_report(  # noqa: PLR0913, PLR0917
+    start: date,
+    end_exclusive: date,
+    response: Response,
+    fields: str | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    selected = _parse_day_fields(fields)
+    if end_exclusive <= start:
+        raise HTTPException(
+            status_code=422, detail="end_exclusive must be after start"
         )
-
-        absence_out: AbsenceResponse | None = None
-        for a in absences:
-            if a.start_date <= d <= a.end_date:
-                r = reasons.get(a.reason_id)
-                if r is not None:
-                    absence_out = AbsenceResponse(
-                        id=a.id,
-                        start_date=a.start_date.isoformat(),
-                        end_date=a.end_date.isoformat(),
-                        reason=AbsenceReasonResponse(id=r.id, name=r.name),
-                    )
-                break
-        days.append(
-            ReportDay(
-                date_local=summary.date_local,
-                worked_minutes=summary.worked_minutes,
-                break_minutes=summary.break_minutes,
-                required_break_minutes=summary.required_break_minutes,
-                break_compliant_total=summary.break_compliant_total,
-                required_continuous_break_minutes=summary.required_continuous_break_minutes,
-                max_continuous_break_minutes=summary.max_continuous_break_minutes,
-                break_compliant_continuous=summary.break_compliant_continuous,
-                has_open_interval=summary.has_open_interval,
-                home_minutes=summary.home_minutes,
-                office_minutes=summary.office_minutes,
-                max_daily_work_exceeded=summary.max_daily_work_exceeded,
-                rest_period_minutes=summary.rest_period_minutes,
-                rest_period_violation=summary.rest_period_violation,
-                absence=absence_out,
-                has_note=summary.date_local in note_days,
-            )
+    if (end_exclusive - start).days > RANGE_MAX_DAYS:
+        raise HTTPException(
+            status_code=422, detail=f"Range is limited to {RANGE_MAX_DAYS} days"
         )
-        total_worked += summary.worked_minutes
-        total_break += summary.break_minutes
-        if summary.worked_minutes > 0:
-            worked_days += 1
-            if summary.home_minutes > summary.office_minutes:
-                home_office_days += 1
-
-    ratio = (home_office_days / worked_days) if worked_days > 0 else 0.0
-    target_ratio = (
-        current_user.settings.home_office_target_ratio if current_user.settings else 0.4
+    if end_exclusive.year >= 9999:  # noqa: PLR2004
+        raise HTTPException(status_code=422, detail="Invalid end_exclusive")
+
+    days = _iter_report_days(
+        db,
+        user=current_user,
+        start_local=start,
+        end_local_exclusive=end_exclusive,
+        now_utc=datetime.now(UTC),
+        chunk_days=RANGE_CHUNK_DAYS,
+        fields=selected,
+    )
+    # The first chunk is computed before the 200 goes out, so lock and
+    # compute errors there still get their own status code.
+    first = next(days)
+    return StreamingResponse(
+        _stream_range_report(
+            user=current_user,
+            start_local=start,
+            end_local_exclusive=end_exclusive,
+            days=chain([first], days),
+            fields=selected,
+        ),
+        media_type="application/json",
+        headers=dict(response.headers),
     )
 
-    return MonthReportResponse(
-        month_start_local=month_start.isoformat(),
-        month_end_local_exclusive=month_end.isoformat(),
-        timezone=tz,
-        total_worked_minutes=total_worked,
-        total_break_minutes=total_break,
-        worked_days=worked_days,
-        home_office_days=home_office_days,
-        home_office_ratio=ratio,
-        home_office_target_ratio=target_ratio,
-        days=days,
+
+@router.get(
+    "/overtime",
+    response_model=OvertimeResponse,
+    dependencies=[Depends(conditional_get)],
+)
+def overtime_report(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    now_utc = datetime.now(UTC)
+    key = (
+        current_user.id,
+        "overtime",
+        local_day(now_utc, current_user.timezone),
+        current_user.data_version,
+    )
+    balance = report_flights.run(
+        key, partial(overtime_balance, db, user=current_user, now_utc=now_utc)
+    )
+    return OvertimeResponse(
+        start_date=balance.start_date.isoformat() if balance.start_date else None,
+        as_of_local=balance.as_of.isoformat(),
+        worked_minutes=balance.worked_minutes,
+        expected_minutes=balance.expected_minutes,
+        balance_minutes=balance.balance_minutes,
+        checkpoint_month=balance.checkpoint_month.isoformat()
+        if balance.checkpoint_month
+        else None,
     )
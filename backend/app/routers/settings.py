@@ -6,7 +6,8 @@ from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.db import get_db
+from app.data_version import bump_data_version
+from app.db import begin_write, get_db
 from app.models import AuthSession, User, UserSettings, utc_now
 from app.schemas import UpdateUserSettingsRequest, UserSettingsResponse
 from app.security import get_current_user
@@ -45,6 +46,7 @@ def update_my_settings(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    begin_write(db)
     user = db.get(User, current_user.id)
     settings = user.settings if user else None
     if settings is None:
@@ -66,6 +68,7 @@ def update_my_settings(
     if payload.push_break_minutes is not None:
         settings.push_break_minutes = payload.push_break_minutes
 
+    bump_data_version(db, current_user.id)
     db.commit()
     db.refresh(settings)
 
@@ -86,6 +89,7 @@ def delete_my_account(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    begin_write(db)
     sessions = list(
         db.scalars(select(AuthSession).where(AuthSession.user_id == current_user.id)).all()
     )
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import date
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel, EmailStr, Field
 
@@ -26,6 +27,18 @@ class UpdateClockEventRequest(BaseModel):
     location: str | None = None
 
 
+class ClockEventEdit(BaseModel):
+    op: Literal["create", "update", "delete"]
+    id: int | None = None
+    ts_utc: datetime | None = None
+    type: str | None = None
+    location: str | None = None
+
+
+class ApplyClockEventEditsRequest(BaseModel):
+    edits: list[ClockEventEdit] = Field(min_length=1, max_length=200)
+
+
 class AbsenceReasonResponse(BaseModel):
     id: int
     name: str
@@ -78,6 +91,35 @@ class ClockEventResponse(BaseModel):
     client_event_id: str | None
 
 
+class CreateClockEventResponse(ClockEventResponse):
+    placement: Literal["appended", "inserted", "duplicate"]
+
+
+class BatchClockEventsRequest(BaseModel):
+    events: list[CreateClockEventRequest] = Field(max_length=500)
+
+
+class BatchClockEventResult(BaseModel):
+    status: Literal["created", "duplicate", "rejected"]
+    event: ClockEventResponse | None = None
+    placement: Literal["appended", "inserted", "duplicate"] | None = None
+    status_code: int | None = None
+    detail: str | None = None
+
+
+class BatchClockEventsResponse(BaseModel):
+    results: list[BatchClockEventResult]
+
+
+class ClockImportResponse(BaseModel):
+    rows_read: int
+    rows_imported: int
+    rows_skipped: int
+    last_committed_ts_utc: str | None
+    error_line: int | None = None
+    error: str | None = None
+
+
 class DailyStatusResponse(BaseModel):
     date_local: str
     timezone: str
@@ -170,6 +212,36 @@ class ReportDay(BaseModel):
     has_note: bool = False
 
 
+# Media type for reports whose ``days`` are sent as a ReportDayColumns object.
+COLUMNAR_MEDIA_TYPE = "application/vnd.stt.columnar+json"
+
+
+class ReportDayColumns(BaseModel):
+    # ReportDay fields as parallel arrays with one entry per day. ``absence``
+    # holds an index into ``absences`` (or null), so an absence spanning
+    # several days is sent once.
+    date_local: list[str]
+    worked_minutes: list[int]
+    break_minutes: list[int]
+    required_break_minutes: list[int]
+    break_compliant_total: list[bool]
+    required_continuous_break_minutes: list[int]
+    max_continuous_break_minutes: list[int]
+    break_compliant_continuous: list[bool]
+    has_open_interval: list[bool]
+    home_minutes: list[int]
+    office_minutes: list[int]
+
+    max_daily_work_exceeded: list[bool]
+    rest_period_minutes: list[int | None]
+    rest_period_violation: list[bool]
+
+    absence: list[int | None]
+    absences: list[AbsenceResponse]
+
+    has_note: list[bool]
+
+
 class WeekReportResponse(BaseModel):
     week_start_local: str
     week_end_local_exclusive: str
@@ -194,6 +266,52 @@ class MonthReportResponse(BaseModel):
     days: list[ReportDay]
 
 
+class RangeReportResponse(BaseModel):
+    start_local: str
+    end_local_exclusive: str
+    timezone: str
+
+    # Streamed before the totals, which are only known at the end.
+    days: list[ReportDay]
+    total_worked_minutes: int
+    total_break_minutes: int
+    worked_days: int
+    home_office_days: int
+    home_office_ratio: float
+
+
+class YearReportMonth(BaseModel):
+    month_start_local: str
+    total_worked_minutes: int
+    total_break_minutes: int
+    worked_days: int
+    home_office_days: int
+    home_office_ratio: float
+
+
+class YearReportResponse(BaseModel):
+    year: int
+    timezone: str
+
+    total_worked_minutes: int
+    total_break_minutes: int
+    worked_days: int
+    home_office_days: int
+    home_office_ratio: float
+    home_office_target_ratio: float
+    months: list[YearReportMonth]
+    days: list[ReportDay]
+
+
+class OvertimeResponse(BaseModel):
+    start_date: str | None
+    as_of_local: str
+    worked_minutes: int
+    expected_minutes: int
+    balance_minutes: int
+    checkpoint_month: str | None
+
+
 class RegisterRequest(BaseModel):
     email: EmailStr
     password: str = Field(min_length=8, max_length=256)
@@ -12,6 +12,9 @@ class Settings(BaseSettings):
     base_url: str = "http://localhost:5173"
 
     sqlite_path: str = "./data/app.db"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_lock_retries: int = 3
+    sqlite_lock_backoff_ms: float = 50
 
     jwt_secret_key: str = "change-me"
     jwt_algorithm: str = "HS256"
@@ -37,5 +40,16 @@ class Settings(BaseSettings):
 
     frontend_dir: str = ""
 
+    clock_group_commit_ms: float = 0
+    clock_group_commit_max_batch: int = 200
+
+    idempotency_cache_size: int = 4096
+
+    report_cache_size: int = 512
+    report_cache_ttl_s: float = 0
+
+    report_pool_workers: int = 0
+    report_pool_min_days: int = 92
+
 
 settings = Settings()
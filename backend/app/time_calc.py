@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import datetime, timedelta, UTC
 
+OPEN_KIND_STATE = {None: "OFF", "WORK": "WORKING", "BREAK": "BREAK"}
+
 
 @dataclass(frozen=True)
 class Interval:
@@ -38,43 +41,120 @@ def required_break_continuous_minutes(net_work_minutes: int) -> int:
     return 30 if required_break_total_minutes(net_work_minutes) > 0 else 0
 
 
-def max_continuous_break_minutes(
-    break_intervals: list[tuple[datetime, datetime]],
-) -> int:
-    if not break_intervals:
-        return 0
-    max_s = 0
-    for start, end in break_intervals:
-        max_s = max(max_s, seconds_between(start, end))
-    return minutes(max_s)
-
-
-def gaps_between_sessions(
-    events: list[tuple[str, datetime]],
+@dataclass(frozen=True)
+class IntervalTotals:
+    state: str
+    last_event_type: str | None
+    last_event_ts_utc: datetime | None
+    first_come_ts_utc: datetime | None
+    last_go_ts_utc: datetime | None
+    worked_seconds: int
+    break_seconds: int
+    home_seconds: int
+    office_seconds: int
+    max_continuous_break_seconds: int
+    has_open_interval: bool
+
+
+# One pass over a day's events, sorted and already normalized to aware UTC.
+# Segments are truncated to whole seconds one by one; the gap between a GO and
+# the next COME counts as break, clipped to the day.
+def summarize_intervals(  # noqa: PLR0912, PLR0915
+    events: Sequence[tuple[str, datetime, str | None]],
     *,
     start_utc: datetime,
     end_utc: datetime,
-) -> list[tuple[datetime, datetime]]:
-    gaps: list[tuple[datetime, datetime]] = []
-    for i in range(len(events) - 1):
-        t1, ts1 = events[i]
-        t2, ts2 = events[i + 1]
-        if t1 != "GO" or t2 != "COME":
-            continue
-        s = max(start_utc, ts1)
-        e = min(end_utc, ts2)
-        if e > s:
-            gaps.append((s, e))
-    return gaps
-
-
-def close_open_interval(
-    start_utc: datetime, *, now_utc: datetime, end_utc: datetime
-) -> tuple[datetime, datetime]:
-    e = min(now_utc, end_utc)
-    if e <= start_utc:
-        return start_utc, start_utc
-    return start_utc, e
+    now_utc: datetime,
+) -> IntervalTotals:
+    worked = 0
+    brk = 0
+    home = 0
+    office = 0
+    max_break = 0
+
+    open_kind: str | None = None
+    open_start: datetime | None = None
+    location: str | None = None
+    first_come: datetime | None = None
+    last_go: datetime | None = None
+    prev_type: str | None = None
+    prev_ts: datetime | None = None
+
+    for t, ts, loc in events:
+        seg = 0
+        if open_start is not None:
+            seg = max(0, int((ts - open_start).total_seconds()))
+
+        if t == "COME":
+            if prev_type == "GO":
+                s = max(prev_ts, start_utc)
+                e = min(ts, end_utc)
+                if e > s:
+                    gap = int((e - s).total_seconds())
+                    brk += gap
+                    max_break = max(max_break, gap)
+            if first_come is None:
+                first_come = ts
+            open_kind = "WORK"
+            open_start = ts
+            location = loc
+        elif t == "BREAK_START":
+            if open_kind == "WORK":
+                worked += seg
+                if location == "HOME":
+                    home += seg
+                elif location == "OFFICE":
+                    office += seg
+            open_kind = "BREAK"
+            open_start = ts
+        elif t == "BREAK_END":
+            if open_kind == "BREAK":
+                brk += seg
+                max_break = max(max_break, seg)
+            open_kind = "WORK"
+            open_start = ts
+        elif t == "GO":
+            if open_kind == "WORK":
+                worked += seg
+                if location == "HOME":
+                    home += seg
+                elif location == "OFFICE":
+                    office += seg
+            elif open_kind == "BREAK":
+                brk += seg
+                max_break = max(max_break, seg)
+            open_kind = None
+            open_start = None
+            location = None
+            last_go = ts
+        prev_type = t
+        prev_ts = ts
+
+    if open_start is not None:
+        seg = max(0, int((min(now_utc, end_utc) - open_start).total_seconds()))
+        if open_kind == "WORK":
+            worked += seg
+            if location == "HOME":
+                home += seg
+            elif location == "OFFICE":
+                office += seg
+        else:
+            brk += seg
+            max_break = max(max_break, seg)
+
+    return IntervalTotals(
+        state=OPEN_KIND_STATE[open_kind],
+        last_event_type=prev_type,
+        last_event_ts_utc=prev_ts,
+        first_come_ts_utc=first_come,
+        last_go_ts_utc=last_go,
+        worked_seconds=worked,
+        break_seconds=brk,
+        home_seconds=home,
+        office_seconds=office,
+        max_continuous_break_seconds=max_break,
+        has_open_interval=open_kind is not None,
+    )
 
 
 def bump_after(last_ts_utc: datetime, now_utc: datetime) -> datetime:
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import random
+import sys
+import time
+from datetime import UTC, date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from app.reporting import (
+    compute_day_summaries,
+    compute_day_summary,
+    day_bounds_utc,
+    iter_local_days,
+)
+
+TZ = "Europe/Berlin"
+TRANSITIONS = {
+    None: ("COME",),
+    "COME": ("BREAK_START", "GO"),
+    "BREAK_START": ("BREAK_END", "GO"),
+    "BREAK_END": ("BREAK_START", "GO"),
+    "GO": ("COME",),
+}
+
+
+def _random_events(rng: random.Random, days: list[date]):
+    events = []
+    last = None
+    for d in days:
+        start_utc, _ = day_bounds_utc(d, TZ)
+        ts = start_utc + timedelta(seconds=rng.randint(0, 8 * 3600))
+        for _ in range(rng.randint(0, 10)):
+            t = rng.choice(TRANSITIONS[last])
+            loc = rng.choice(("HOME", "OFFICE")) if t == "COME" else None
+            events.append((t, ts, loc))
+            last = t
+            ts += timedelta(
+                seconds=rng.randint(1, 2 * 3600), microseconds=rng.randint(0, 999_999)
+            )
+    return events
+
+
+def _per_day(start: date, end: date, events, now_utc: datetime):
+    zone = ZoneInfo(TZ)
+    by_day: dict[date, list] = {}
+    for e in events:
+        by_day.setdefault(e[1].astimezone(zone).date(), []).append(e)
+    return [
+        compute_day_summary(
+            day_local=d, tz=TZ, events=by_day.get(d, []), now_utc=now_utc
+        )
+        for d in iter_local_days(start, end)
+    ]
+
+
+def main() -> None:
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5  # noqa: PLR2004
+    start = date(2022, 1, 1)
+    end = date(2022 + years, 1, 1)
+    events = _random_events(random.Random(1), iter_local_days(start, end))
+    now_utc = datetime(2022 + years - 1, 7, 1, 12, tzinfo=UTC)
+
+    per_day = _per_day(start, end, events, now_utc)
+    batch = compute_day_summaries(
+        start_local=start,
+        end_local_exclusive=end,
+        tz=TZ,
+        events=events,
+        now_utc=now_utc,
+    )
+    assert per_day == batch
+
+    print(f"{len(events)} events over {len(batch)} days")
+    print(f"{'path':>8} {'median ms':>10}")
+    for label, run in (
+        ("per-day", lambda: _per_day(start, end, events, now_utc)),
+        (
+            "batch",
+            lambda: compute_day_summaries(
+                start_local=start,
+                end_local_exclusive=end,
+                tz=TZ,
+                events=events,
+                now_utc=now_utc,
+            ),
+        ),
+    ):
+        samples = []
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            run()
+            samples.append(time.perf_counter() - t0)
+        samples.sort()
+        print(f"{label:>8} {samples[len(samples) // 2] * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
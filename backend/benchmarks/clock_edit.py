@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+
+os.environ.setdefault(
+    "TT_SQLITE_PATH", os.path.join(tempfile.mkdtemp(), "bench.db")
+)
+
+from app.db import Base, SessionLocal, engine
+from app.models import ClockEvent, User
+from app.routers.clock import update_event
+from app.schemas import UpdateClockEventRequest
+
+DAY_TYPES = ("COME", "BREAK_START", "BREAK_END", "GO")
+
+
+def _seed(db, *, email: str, days: int) -> User:
+    user = User(email=email, password_hash="x")
+    db.add(user)
+    db.flush()
+
+    start = datetime.now(UTC) - timedelta(days=days)
+    rows = []
+    for d in range(days):
+        t = start + timedelta(days=d, hours=8)
+        for i, event_type in enumerate(DAY_TYPES):
+            rows.append(
+                {
+                    "user_id": user.id,
+                    "ts_utc": t + timedelta(hours=2 * i),
+                    "type": event_type,
+                    "location": "OFFICE" if event_type == "COME" else None,
+                }
+            )
+    db.execute(ClockEvent.__table__.insert(), rows)
+    db.commit()
+    return user
+
+
+def _bench(days: int, repeats: int) -> float:
+    with SessionLocal() as db:
+        user_id = _seed(db, email=f"bench-{days}@example.com", days=days).id
+        last_go = db.scalar(
+            ClockEvent.__table__.select()
+            .with_only_columns(ClockEvent.id)
+            .where(ClockEvent.user_id == user_id)
+            .order_by(ClockEvent.ts_utc.desc())
+            .limit(1)
+        )
+
+    samples = []
+    for i in range(repeats):
+        with SessionLocal() as db:
+            user = db.get(User, user_id)
+            event = db.get(ClockEvent, last_go)
+            ts = event.ts_utc.replace(tzinfo=UTC) + timedelta(
+                seconds=1 if i % 2 == 0 else -1
+            )
+            t0 = time.perf_counter()
+            update_event(
+                last_go,
+                UpdateClockEventRequest(ts_utc=ts),
+                db=db,
+                current_user=user,
+            )
+            samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    Base.metadata.create_all(engine)
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    print(f"{'history days':>12} {'events':>8} {'median ms':>10}")
+    for days in (30, 365, 3650, 10000):
+        ms = _bench(days, repeats)
+        print(f"{days:>12} {days * len(DAY_TYPES):>8} {ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault(
+    "TT_SQLITE_PATH", os.path.join(tempfile.mkdtemp(), "bench.db")
+)
+
+from app.db import Base, SessionLocal, engine
+from app.models import User
+from app.routers.clock import create_event
+from app.schemas import CreateClockEventRequest
+from app.settings import settings
+
+# Starlette runs sync endpoints on a 40-thread pool per worker.
+THREADPOOL_SIZE = 40
+
+
+def _seed_users(prefix: str, n: int) -> list[int]:
+    with SessionLocal() as db:
+        users = [
+            User(email=f"{prefix}-{i}@example.com", password_hash="x")
+            for i in range(n)
+        ]
+        db.add_all(users)
+        db.commit()
+        return [u.id for u in users]
+
+
+def _clock_in(user_id: int, submitted: float) -> float:
+    # Same session get_db hands the endpoint: reads only until it writes.
+    with SessionLocal() as db:
+        user = db.get(User, user_id)
+        create_event(
+            CreateClockEventRequest(type="COME", location="OFFICE"),
+            db=db,
+            current_user=user,
+        )
+    return time.perf_counter() - submitted
+
+
+def _percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def _run(label: str, n: int) -> None:
+    user_ids = _seed_users(label, n)
+    errors = 0
+    latencies: list[float] = []
+    with ThreadPoolExecutor(max_workers=THREADPOOL_SIZE) as pool:
+        t0 = time.perf_counter()
+        futures = [pool.submit(_clock_in, uid, t0) for uid in user_ids]
+        for f in futures:
+            try:
+                latencies.append(f.result())
+            except Exception:  # noqa: BLE001
+                errors += 1
+        wall = time.perf_counter() - t0
+
+    print(
+        f"{label:>14} {n:>6} {_percentile(latencies, 0.5) * 1000:>9.1f}"
+        f" {_percentile(latencies, 0.99) * 1000:>9.1f} {wall:>8.2f} {errors:>6}"
+    )
+
+
+def main() -> None:
+    Base.metadata.create_all(engine)
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    window_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 5  # noqa: PLR2004
+
+    print(
+        f"{'mode':>14} {'reqs':>6} {'p50 ms':>9} {'p99 ms':>9}"
+        f" {'wall s':>8} {'errors':>6}"
+    )
+    settings.clock_group_commit_ms = 0
+    _run("per-request", n)
+    settings.clock_group_commit_ms = window_ms
+    _run(f"group-{window_ms:g}ms", n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import random
+import sys
+import time
+from datetime import UTC, date, datetime, timedelta
+from itertools import pairwise
+
+from app.reporting import compute_day_summary, day_bounds_utc
+from app.time_calc import minutes, seconds_between, summarize_intervals
+
+TZ = "Europe/Berlin"
+TRANSITIONS = {
+    None: ("COME",),
+    "COME": ("BREAK_START", "GO"),
+    "BREAK_START": ("BREAK_END", "GO"),
+    "BREAK_END": ("BREAK_START", "GO"),
+    "GO": ("COME",),
+}
+
+
+# Frozen copy of the per-day loop that compute_day_summary and the dashboard
+# used before the shared engine: one pass for segments, a second for GO->COME
+# gaps and a third for the longest break.
+def _legacy(events, *, start_utc, end_utc, now_utc):  # noqa: PLR0912
+    worked = brk = home = office = 0
+    open_kind = None
+    open_start = None
+    location = None
+    breaks = []
+    for t, ts, loc in events:
+        if t == "COME":
+            open_kind, open_start, location = "WORK", ts, loc
+        elif t == "BREAK_START":
+            if open_kind == "WORK":
+                seg = seconds_between(open_start, ts)
+                worked += seg
+                home += seg if location == "HOME" else 0
+                office += seg if location == "OFFICE" else 0
+            open_kind, open_start = "BREAK", ts
+        elif t == "BREAK_END":
+            if open_kind == "BREAK":
+                brk += seconds_between(open_start, ts)
+                breaks.append((open_start, ts))
+            open_kind, open_start = "WORK", ts
+        elif t == "GO":
+            if open_kind == "WORK":
+                seg = seconds_between(open_start, ts)
+                worked += seg
+                home += seg if location == "HOME" else 0
+                office += seg if location == "OFFICE" else 0
+            elif open_kind == "BREAK":
+                brk += seconds_between(open_start, ts)
+                breaks.append((open_start, ts))
+            open_kind = open_start = location = None
+    if open_kind is not None:
+        seg_end = min(now_utc, end_utc)
+        seg = seconds_between(open_start, seg_end)
+        if open_kind == "WORK":
+            worked += seg
+            home += seg if location == "HOME" else 0
+            office += seg if location == "OFFICE" else 0
+        else:
+            brk += seg
+            if seg_end > open_start:
+                breaks.append((open_start, seg_end))
+    for (t1, ts1, _), (t2, ts2, _) in pairwise(events):
+        if t1 == "GO" and t2 == "COME":
+            s, e = max(start_utc, ts1), min(end_utc, ts2)
+            if e > s:
+                brk += seconds_between(s, e)
+                breaks.append((s, e))
+    max_cont = max((seconds_between(s, e) for s, e in breaks), default=0)
+    return (
+        minutes(worked),
+        minutes(brk),
+        minutes(home),
+        minutes(office),
+        minutes(max_cont),
+        open_kind is not None,
+    )
+
+
+def _random_day(rng: random.Random, day: date):
+    start_utc, _ = day_bounds_utc(day, TZ)
+    ts = start_utc + timedelta(seconds=rng.randint(0, 6 * 3600))
+    events = []
+    last = None
+    for _ in range(rng.randint(0, 12)):
+        t = rng.choice(TRANSITIONS[last])
+        loc = rng.choice(("HOME", "OFFICE")) if t == "COME" else None
+        events.append((t, ts, loc))
+        last = t
+        ts += timedelta(
+            seconds=rng.randint(1, 3 * 3600), microseconds=rng.randint(0, 999_999)
+        )
+    return events
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rng = random.Random(1)
+    first = date(2024, 1, 1)
+    days = [first + timedelta(days=i % 366) for i in range(n)]
+    cases = [(d, _random_day(rng, d), *day_bounds_utc(d, TZ)) for d in days]
+    now_utc = datetime(2024, 6, 15, 12, tzinfo=UTC)
+
+    t0 = time.perf_counter()
+    for _d, events, start_utc, end_utc in cases:
+        _legacy(events, start_utc=start_utc, end_utc=end_utc, now_utc=now_utc)
+    t_legacy = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _d, events, start_utc, end_utc in cases:
+        summarize_intervals(
+            events, start_utc=start_utc, end_utc=end_utc, now_utc=now_utc
+        )
+    t_current = time.perf_counter() - t0
+
+    for d, events, start_utc, end_utc in cases:
+        old = _legacy(events, start_utc=start_utc, end_utc=end_utc, now_utc=now_utc)
+        new = compute_day_summary(day_local=d, tz=TZ, events=events, now_utc=now_utc)
+        assert old == (
+            new.worked_minutes,
+            new.break_minutes,
+            new.home_minutes,
+            new.office_minutes,
+            new.max_continuous_break_minutes,
+            new.has_open_interval,
+        ), (old, new)
+
+    print(f"{'engine':>8} {'days':>7} {'total ms':>9} {'us/day':>8}")
+    for label, elapsed in (("legacy", t_legacy), ("shared", t_current)):
+        print(f"{label:>8} {n:>7} {elapsed * 1000:>9.1f} {elapsed / n * 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import gzip
+import json
+import random
+import sys
+import time
+from datetime import UTC, date, datetime, timedelta
+
+from app.report_encoding import columnar_json
+from app.reporting import compute_day_summary, day_bounds_utc
+from app.schemas import (
+    AbsenceReasonResponse,
+    AbsenceResponse,
+    ReportDay,
+    YearReportResponse,
+)
+
+TZ = "Europe/Berlin"
+REPEAT = 50
+
+
+def _year_report(rng: random.Random, year: int) -> YearReportResponse:
+    reasons = [
+        AbsenceReasonResponse(id=i, name=n) for i, n in enumerate(("Vac", "Sick"))
+    ]
+    now_utc = datetime(year + 1, 1, 1, tzinfo=UTC)
+    days: list[ReportDay] = []
+    absence: AbsenceResponse | None = None
+    d = date(year, 1, 1)
+    while d.year == year:
+        if absence is not None and date.fromisoformat(absence.end_date) < d:
+            absence = None
+        if absence is None and rng.random() < 0.02:  # noqa: PLR2004
+            end = d + timedelta(days=rng.randint(0, 9))
+            absence = AbsenceResponse(
+                id=len(days),
+                start_date=d.isoformat(),
+                end_date=end.isoformat(),
+                reason=rng.choice(reasons),
+            )
+        events = []
+        if absence is None and d.weekday() < 5:  # noqa: PLR2004
+            start_utc, _ = day_bounds_utc(d, TZ)
+            come = start_utc + timedelta(hours=7, minutes=rng.randint(0, 90))
+            brk = come + timedelta(hours=4)
+            events = [
+                ("COME", come, rng.choice(("HOME", "OFFICE"))),
+                ("BREAK_START", brk, None),
+                ("BREAK_END", brk + timedelta(minutes=rng.randint(20, 60)), None),
+                ("GO", come + timedelta(hours=9, minutes=rng.randint(0, 60)), None),
+            ]
+        s = compute_day_summary(day_local=d, tz=TZ, events=events, now_utc=now_utc)
+        days.append(
+            ReportDay(
+                **vars(s), absence=absence, has_note=rng.random() < 0.05  # noqa: PLR2004
+            )
+        )
+        d += timedelta(days=1)
+
+    return YearReportResponse(
+        year=year,
+        timezone=TZ,
+        total_worked_minutes=sum(x.worked_minutes for x in days),
+        total_break_minutes=sum(x.break_minutes for x in days),
+        worked_days=0,
+        home_office_days=0,
+        home_office_ratio=0.0,
+        home_office_target_ratio=0.4,
+        months=[],
+        days=days,
+    )
+
+
+def _time(fn) -> tuple[float, bytes]:
+    t0 = time.perf_counter()
+    for _ in range(REPEAT):
+        body = fn()
+    return (time.perf_counter() - t0) / REPEAT, body
+
+
+def main() -> None:
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    rng = random.Random(1)
+    reports = [_year_report(rng, 2020 + i) for i in range(years)]
+
+    rows = [_time(lambda r=r: r.model_dump_json().encode()) for r in reports]
+    cols = [_time(lambda r=r: columnar_json(r)) for r in reports]
+
+    for (_, a), (_, b) in zip(rows, cols, strict=True):
+        c = json.loads(b)["days"]
+        assert json.loads(a)["days"] == [
+            {
+                **{k: c[k][i] for k in c if k not in ("absence", "absences")},
+                "absence": None
+                if c["absence"][i] is None
+                else c["absences"][c["absence"][i]],
+            }
+            for i in range(len(c["date_local"]))
+        ]
+
+    print(f"{'encoding':>9} {'bytes':>9} {'gzip':>7} {'ms/report':>10}")
+    for label, results in (("rows", rows), ("columnar", cols)):
+        size = sum(len(body) for _, body in results) // years
+        gz = sum(len(gzip.compress(body)) for _, body in results) // years
+        ms = sum(t for t, _ in results) / years * 1000
+        print(f"{label:>9} {size:>9} {gz:>7} {ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 import { openDB, type DBSchema } from 'idb'
 import { apiFetch } from './api'
-import type { CreateClockEventRequest } from './types'
+import type { BatchClockEventsResponse, CreateClockEventRequest } from './types'
 
 type QueuedClockEvent = {
   id: string
@@ -27,6 +27,8 @@ const dbPromise = openDB<TimeTrackingDB>('time-tracking', 1, {
 
 const listeners = new Set<QueueListener>()
 
+const FLUSH_BATCH_SIZE = 100
+
 async function emitCount() {
   const db = await dbPromise
   const count = await db.count('clock_event_queue')
@@ -70,24 +72,27 @@ export async function flushClockEventQueue(): Promise<{ sent: number; remaining:
 
   let sent = 0
 
-  while (true) {
-    const tx = db.transaction('clock_event_queue', 'readonly')
-    const index = tx.store.index('by-created')
-    const cursor = await index.openCursor()
-    await tx.done
-
-    if (!cursor) break
-    const item = cursor.value
+  const items = await db.getAllFromIndex('clock_event_queue', 'by-created')
+  for (let i = 0; i < items.length; i += FLUSH_BATCH_SIZE) {
+    const chunk = items.slice(i, i + FLUSH_BATCH_SIZE)
 
+    let res: BatchClockEventsResponse
     try {
-      await apiFetch('/clock/events', { method: 'POST', body: item.payload })
-      const delTx = db.transaction('clock_event_queue', 'readwrite')
-      await delTx.store.delete(item.id)
-      await delTx.done
-      sent += 1
+      res = await apiFetch<BatchClockEventsResponse>('/clock/events:batch', {
+        method: 'POST',
+        body: { events: chunk.map((item) => item.payload) },
+      })
     } catch {
       break
     }
+
+    const delTx = db.transaction('clock_event_queue', 'readwrite')
+    for (const [idx, result] of res.results.entries()) {
+      if (result.status === 'rejected') continue
+      await delTx.store.delete(chunk[idx].id)
+      sent += 1
+    }
+    await delTx.done
   }
 
   const remaining = await db.count('clock_event_queue')
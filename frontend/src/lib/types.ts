@@ -65,6 +65,18 @@ export type ClockEvent = {
   client_event_id: string | null
 }
 
+export type BatchClockEventResult = {
+  status: 'created' | 'duplicate' | 'rejected'
+  event: ClockEvent | null
+  placement: 'appended' | 'inserted' | 'duplicate' | null
+  status_code: number | null
+  detail: string | null
+}
+
+export type BatchClockEventsResponse = {
+  results: BatchClockEventResult[]
+}
+
 export type ReportDay = {
   date_local: string
   worked_minutes: number
@@ -112,6 +124,15 @@ export type WeekReport = {
   days: ReportDay[]
 }
 
+export type OvertimeReport = {
+  start_date: string | null
+  as_of_local: string
+  worked_minutes: number
+  expected_minutes: number
+  balance_minutes: number
+  checkpoint_month: string | null
+}
+
 export type MonthReport = {
   month_start_local: string
   month_end_local_exclusive: string
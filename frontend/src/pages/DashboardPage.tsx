@@ -2,7 +2,12 @@ import { useEffect, useMemo, useRef, useState } from 'react'
 import { apiFetch } from '../lib/api'
 import { deleteDayNote, getDayNote, upsertDayNote } from '../lib/notes'
 import { useAuth } from '../lib/auth'
-import type { CreateClockEventRequest, DailyStatusResponse, MonthReport } from '../lib/types'
+import type {
+  CreateClockEventRequest,
+  DailyStatusResponse,
+  MonthReport,
+  OvertimeReport,
+} from '../lib/types'
 import { enqueueClockEvent, flushClockEventQueue, subscribeQueueCount } from '../lib/offlineQueue'
 import { useI18n } from '../lib/i18n'
 import { formatDateLocal, parseIsoDateUtc } from '../lib/format'
@@ -80,6 +85,7 @@ export function DashboardPage() {
 
   const [status, setStatus] = useState<DailyStatusResponse | null>(null)
   const [month, setMonth] = useState<MonthReport | null>(null)
+  const [overtime, setOvertime] = useState<OvertimeReport | null>(null)
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState<string | null>(null)
 
@@ -134,8 +140,12 @@ export function DashboardPage() {
   }
 
   async function loadMonth() {
-    const data = await apiFetch<MonthReport>('/reports/month')
+    const [data, balance] = await Promise.all([
+      apiFetch<MonthReport>('/reports/month'),
+      apiFetch<OvertimeReport>('/reports/overtime'),
+    ])
     setMonth(data)
+    setOvertime(balance)
   }
 
   useEffect(() => {
@@ -273,32 +283,6 @@ export function DashboardPage() {
     await createEvent(base)
   }
 
-  const overtime = useMemo(() => {
-    if (!status || !month) return null
-
-    const start = status.overtime_start_date
-
-    let balanceMinutes = 0
-    let expectedMinutes = 0
-    let workedMinutes = 0
-
-    for (const d of month.days) {
-      if (d.date_local > status.date_local) continue
-
-      if (start && isBeforeLocalDate(d.date_local, start)) continue
-
-      if (d.absence) continue
-
-      const weekend = isWeekendDate(d.date_local)
-      const expected = weekend ? 0 : status.target_minutes
-      expectedMinutes += expected
-      workedMinutes += d.worked_minutes
-      balanceMinutes += d.worked_minutes - expected
-    }
-
-    return { balanceMinutes, expectedMinutes, workedMinutes }
-  }, [month, status])
-
   const heatmapDays = useMemo(() => {
     if (!status || !month) return []
     const target = status.target_minutes
@@ -514,9 +498,9 @@ export function DashboardPage() {
         {overtime ? (
           <div className="row">
             <span className="muted">{t('dashboard.overtimeBalanceToDate')}</span>
-            <strong className={overtime.balanceMinutes >= 0 ? 'okText' : 'errorText'}>
-              {overtime.balanceMinutes >= 0 ? '+' : '-'}
-              {formatMinutes(Math.abs(overtime.balanceMinutes))}
+            <strong className={overtime.balance_minutes >= 0 ? 'okText' : 'errorText'}>
+              {overtime.balance_minutes >= 0 ? '+' : '-'}
+              {formatMinutes(Math.abs(overtime.balance_minutes))}
             </strong>
           </div>
         ) : null}